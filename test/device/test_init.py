@@ -22,6 +22,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import pytest
 import torchquantum as tq
 import torch
 from torchquantum.macro import C_DTYPE, C_DTYPE_NUMPY
@@ -41,3 +42,75 @@ def test_state_init():
         qdev.get_states_1d().cpu().data.numpy(),
         np.array([[1, 0, 0, 0]], dtype=C_DTYPE_NUMPY),
     )
+
+
+def _embed(mat, wires, n_wires):
+    # the unitary of a gate on the wires of an n_wires statevector
+    dim = 2 ** len(wires)
+    rest = [w for w in range(n_wires) if w not in wires]
+    full = np.kron(mat, np.eye(2 ** len(rest))).reshape([2] * 2 * n_wires)
+    order = list(wires) + rest
+    perm = [order.index(w) for w in range(n_wires)]
+    return full.transpose(perm + [n_wires + p for p in perm]).reshape(
+        2**n_wires, 2**n_wires
+    )
+
+
+def _controlled(mat):
+    # the unitary of a single-qubit gate controlled by the first wire
+    return np.block([[np.eye(2), np.zeros((2, 2))], [np.zeros((2, 2)), mat]])
+
+
+def test_state_dtype():
+    qdev = tq.QuantumDevice(n_wires=3, bsz=2, dtype=torch.complex128)
+    qdev_single = tq.QuantumDevice(n_wires=3, bsz=2)
+    params = torch.rand(2, 1, dtype=torch.float64, requires_grad=True)
+
+    for device in [qdev, qdev_single]:
+        device.h(wires=0)
+        device.rx(wires=1, params=params)
+        device.cnot(wires=[0, 2])
+        device.crx(wires=[2, 1], params=params)
+        device.rz(wires=0, params=params)
+        device.t(wires=2)
+
+    assert qdev.states.dtype == torch.complex128
+    assert qdev_single.states.dtype == C_DTYPE
+
+    expected = []
+    for theta in params.detach().numpy()[:, 0]:
+        co, si = np.cos(theta / 2), np.sin(theta / 2)
+        rx = np.array([[co, -1j * si], [-1j * si, co]])
+        ops = [
+            (np.array([[1, 1], [1, -1]]) / np.sqrt(2), [0]),
+            (rx, [1]),
+            (_controlled(np.array([[0, 1], [1, 0]])), [0, 2]),
+            (_controlled(rx), [2, 1]),
+            (np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)]), [0]),
+            (np.diag([1, np.exp(0.25j * np.pi)]), [2]),
+        ]
+        state = np.eye(8)[0]
+        for mat, wires in ops:
+            state = _embed(mat, wires, 3) @ state
+        expected.append(state)
+
+    # the gate matrices are computed in the precision of the states
+    np.testing.assert_allclose(
+        qdev.get_states_1d().cpu().data.numpy(), np.array(expected), atol=1e-12
+    )
+    np.testing.assert_allclose(
+        qdev_single.get_states_1d().cpu().data.numpy(), np.array(expected), atol=1e-6
+    )
+
+    # the unitary of qubitunitary gates keeps the precision as well
+    qdev = tq.QuantumDevice(n_wires=1, dtype=torch.complex128)
+    inv_sqrt2 = 1 / np.sqrt(2)
+    qdev.qubitunitary(wires=0, params=[[inv_sqrt2, inv_sqrt2], [inv_sqrt2, -inv_sqrt2]])
+    np.testing.assert_allclose(
+        qdev.get_states_1d().cpu().data.numpy(),
+        np.array([[inv_sqrt2, inv_sqrt2]]),
+        atol=1e-15,
+    )
+
+    with pytest.raises(ValueError):
+        tq.QuantumDevice(n_wires=1, dtype=torch.complex32)
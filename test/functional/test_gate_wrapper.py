@@ -0,0 +1,327 @@
+"""
+MIT License
+
+Copyright (c) 2020-present TorchQuantum Authors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import pytest
+import torch
+import numpy as np
+import torchquantum as tq
+import torchquantum.functional as tqf
+from torchquantum.functional.gate_wrapper import (
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    _apply_unitary_einsum_contraction,
+    ConstantGate,
+    apply_diagonal,
+    apply_controlled,
+)
+from test.utils import check_all_close
+
+
+def test_apply_unitary_einsum():
+    for n_wires in range(1, 6):
+        for k in range(1, n_wires + 1):
+            for is_batch_unitary in [False, True]:
+                bsz = 3
+                state = torch.randn([bsz] + [2] * n_wires, dtype=torch.complex64)
+                wires = np.random.permutation(n_wires)[:k].tolist()
+                shape = [bsz, 2**k, 2**k] if is_batch_unitary else [2**k, 2**k]
+                mat = torch.randn(shape, dtype=torch.complex64)
+
+                expected = apply_unitary_bmm(state, mat, wires)
+                check_all_close(apply_unitary_einsum(state, mat, wires), expected)
+                check_all_close(
+                    _apply_unitary_einsum_contraction(state, mat, wires), expected
+                )
+
+
+def test_apply_unitary_einsum_many_wires():
+    # an empty batch, more qubits than letters in the alphabet
+    state = torch.zeros([0] + [2] * 30, dtype=torch.complex64)
+    for wires in [[27], [3, 29]]:
+        mat = torch.eye(2 ** len(wires), dtype=torch.complex64)
+        new_state = _apply_unitary_einsum_contraction(state, mat, wires)
+        assert new_state.shape == state.shape
+
+
+def test_apply_unitary_einsum_broadcast():
+    state = torch.randn([3, 2, 2, 2], dtype=torch.complex64)
+    mat = torch.randn([1, 4, 4], dtype=torch.complex64)
+    check_all_close(
+        apply_unitary_einsum(state, mat, [2, 0]),
+        apply_unitary_bmm(state, mat[0], [2, 0]),
+    )
+
+    state = torch.randn([1, 2, 2, 2], dtype=torch.complex64)
+    mat = torch.randn([3, 4, 4], dtype=torch.complex64)
+    check_all_close(
+        apply_unitary_einsum(state, mat, [2, 0]),
+        apply_unitary_bmm(state.expand(3, 2, 2, 2), mat, [2, 0]),
+    )
+
+
+def test_apply_diagonal():
+    for n_wires in range(1, 5):
+        for k in range(1, n_wires + 1):
+            for shape in [[2**k], [3, 2**k]]:
+                state = torch.randn([3] + [2] * n_wires, dtype=torch.complex64)
+                wires = np.random.permutation(n_wires)[:k].tolist()
+                eigvals = torch.randn(shape, dtype=torch.complex64)
+
+                check_all_close(
+                    apply_diagonal(state, eigvals, wires),
+                    apply_unitary_bmm(state, torch.diag_embed(eigvals), wires),
+                )
+
+
+def test_apply_controlled():
+    for wires in [[0, 1], [2, 0], [1, 3]]:
+        for bsz in [1, 3]:
+            state = torch.randn([3, 2, 2, 2, 2], dtype=torch.complex64)
+            params = torch.rand(bsz, 1)
+
+            check_all_close(
+                apply_controlled(
+                    state, tqf.rx_matrix(params), wires[:1], wires[1:]
+                ),
+                apply_unitary_bmm(state, tqf.mat_dict["crx"](params), wires),
+            )
+
+    state = torch.randn([3, 2, 2, 2, 2], dtype=torch.complex64)
+    check_all_close(
+        apply_controlled(state, tqf.mat_dict["paulix"], [3, 1], [0]),
+        apply_unitary_bmm(state, tqf.mat_dict["toffoli"], [3, 1, 0]),
+    )
+
+    # a batch of unitaries applied to a single state
+    params = torch.rand(3, 1)
+    qdev = tq.QuantumDevice(n_wires=2, bsz=1)
+    tqf.hadamard(qdev, wires=0)
+    expected = apply_unitary_bmm(
+        qdev.states.expand(3, 2, 2), tqf.mat_dict["crx"](params), [0, 1]
+    )
+    tqf.crx(qdev, wires=[0, 1], params=params, comp_method="einsum")
+    check_all_close(qdev.states, expected)
+
+
+def test_controlled_gates():
+    for name, wires in [
+        ("cnot", [2, 0]),
+        ("cy", [0, 3]),
+        ("cz", [1, 2]),
+        ("chadamard", [3, 1]),
+        ("toffoli", [3, 0, 1]),
+        ("ccz", [0, 2, 1]),
+        ("cswap", [1, 3, 0]),
+        ("c3x", [2, 0, 3, 1]),
+    ]:
+        for inverse in [False, True]:
+            state = torch.randn([3, 2, 2, 2, 2], dtype=torch.complex64)
+            qdev = tq.QuantumDevice(n_wires=4, bsz=3)
+            qdev.set_states(state)
+            tqf.func_name_dict[name](qdev, wires=wires, inverse=inverse)
+
+            mat = tqf.mat_dict[name]
+            mat = mat.conj().T if inverse else mat
+            check_all_close(qdev.states, apply_unitary_bmm(state, mat, wires))
+
+
+def test_gate_einsum_bmm_consistent():
+    qdev_einsum = tq.QuantumDevice(n_wires=4, bsz=2)
+    qdev_bmm = tq.QuantumDevice(n_wires=4, bsz=2)
+    params = torch.rand(2, 1)
+
+    for qdev, method in [(qdev_einsum, "einsum"), (qdev_bmm, "bmm")]:
+        tqf.hadamard(qdev, wires=0, comp_method=method)
+        tqf.rx(qdev, wires=2, params=params, comp_method=method)
+        tqf.cnot(qdev, wires=[2, 1], comp_method=method)
+        tqf.crx(qdev, wires=[0, 3], params=params, comp_method=method)
+        tqf.cswap(qdev, wires=[3, 0, 2], comp_method=method)
+        tqf.multirz(qdev, wires=[1, 2, 3], params=params, n_wires=3, comp_method=method)
+        tqf.rz(qdev, wires=3, params=params, inverse=True, comp_method=method)
+        tqf.phaseshift(qdev, wires=1, params=params, comp_method=method)
+
+    check_all_close(qdev_einsum.get_states_1d(), qdev_bmm.get_states_1d())
+
+    # the diagonal and controlled gates check the method as well
+    with pytest.raises(NotImplementedError):
+        tqf.cnot(qdev_bmm, wires=[2, 1], comp_method="none")
+    with pytest.raises(NotImplementedError):
+        tqf.rz(qdev_bmm, wires=3, params=params, comp_method="none")
+
+
+def test_gate_fusion():
+    qdev = tq.QuantumDevice(n_wires=3, bsz=2)
+    qdev_fused = tq.QuantumDevice(n_wires=3, bsz=2, fuse_gates=True)
+    params = torch.rand(2, 1)
+
+    for device in [qdev, qdev_fused]:
+        tqf.hadamard(device, wires=0)
+        tqf.rx(device, wires=0, params=params)
+        tqf.cnot(device, wires=[0, 1])
+        tqf.ry(device, wires=1, params=params)
+        tqf.rz(device, wires=0, params=params, inverse=True)
+        tqf.sx(device, wires=2)
+        tqf.crx(device, wires=[2, 1], params=params)
+        tqf.crx(device, wires=[1, 2], params=params * 2, inverse=True)
+        tqf.rzz(device, wires=[2, 0], params=params)
+        tqf.hadamard(device, wires=1)
+        tqf.multirz(device, wires=[1, 0], params=params, n_wires=2)
+        tqf.phaseshift(device, wires=0, params=params)
+
+    assert len(qdev_fused._pending) == 1
+    check_all_close(qdev_fused.get_states_1d(), qdev.get_states_1d())
+    assert len(qdev_fused._pending) == 0
+
+
+def test_gate_fusion_wide_gates():
+    qdev = tq.QuantumDevice(n_wires=3, bsz=2)
+    qdev_fused = tq.QuantumDevice(n_wires=3, bsz=2, fuse_gates=True)
+    params = torch.rand(2, 1)
+
+    # single-qubit gates around a gate wider than FUSION_MAX_WIRES
+    for device in [qdev, qdev_fused]:
+        tqf.paulix(device, wires=0)
+        tqf.cswap(device, wires=[0, 1, 2])
+        tqf.hadamard(device, wires=2)
+        tqf.rx(device, wires=2, params=params)
+        tqf.toffoli(device, wires=[0, 2, 1])
+        tqf.hadamard(device, wires=1)
+
+    check_all_close(qdev_fused.get_states_1d(), qdev.get_states_1d())
+
+    # the non-unitary and state preparation ops apply the deferred gates first
+    qdev_fused.reset_states(bsz=1)
+    tqf.hadamard(qdev_fused, wires=0)
+    tqf.reset(qdev_fused, wires=0)
+    check_all_close(qdev_fused.get_states_1d(), np.array([[1, 0, 0, 0, 0, 0, 0, 0]]))
+
+    tqf.hadamard(qdev_fused, wires=0)
+    tq.StateEncoder()(qdev_fused, torch.tensor([[0.0, 1.0]]))
+    check_all_close(qdev_fused.get_states_1d(), np.array([[0, 1, 0, 0, 0, 0, 0, 0]]))
+
+
+def test_constant_gate_cache():
+    mat = tqf.mat_dict["cnot"]
+    gate = ConstantGate.from_tensor(mat)
+    assert ConstantGate.from_tensor(mat) is gate
+
+    device = torch.device("cpu")
+    assert gate.get(device, torch.complex64) is gate.get(device, torch.complex64)
+    check_all_close(
+        ConstantGate.from_tensor(tqf.mat_dict["s"]).get(device, torch.complex64, True),
+        np.array([[1, 0], [0, -1j]]),
+    )
+
+    qdev = tq.QuantumDevice(n_wires=2)
+    tqf.sx(qdev, wires=1)
+    tqf.sx(qdev, wires=1, inverse=True)
+    check_all_close(qdev.get_states_1d(), np.array([[1, 0, 0, 0]]))
+
+    # the matrices built at runtime are not kept by the registry
+    n_registered = len(ConstantGate._registry)
+    tqf.hadamard(qdev, wires=0)
+    for _ in range(5):
+        tqf.controlled_unitary(
+            qdev, c_wires=0, t_wires=1, params=tqf.mat_dict["paulix"]
+        )
+    assert len(ConstantGate._registry) == n_registered
+    check_all_close(
+        qdev.get_states_1d(), np.array([[1, 0, 0, 1]]) / np.sqrt(2)
+    )
+
+
+def test_compile():
+    def circuit(qdev, params):
+        tqf.hadamard(qdev, wires=0)
+        tqf.rx(qdev, wires=1, params=params[:, 0])
+        tqf.cnot(qdev, wires=[0, 2])
+        tqf.crx(qdev, wires=[2, 1], params=params[:, 1])
+        tqf.rz(qdev, wires=0, params=params[:, 2])
+        return qdev.get_states_1d()
+
+    params = torch.rand(2, 3)
+    compiled = tq.compile(circuit, backend="eager", fullgraph=True)
+    check_all_close(
+        compiled(tq.QuantumDevice(n_wires=3, bsz=2), params),
+        circuit(tq.QuantumDevice(n_wires=3, bsz=2), params),
+    )
+
+
+def test_gate_compile_method():
+    qdev = tq.QuantumDevice(n_wires=3, bsz=2)
+    qdev_compile = tq.QuantumDevice(n_wires=3, bsz=2)
+    params = torch.rand(2, 1)
+
+    for device, method in [(qdev, "bmm"), (qdev_compile, "compile")]:
+        tqf.hadamard(device, wires=0, comp_method=method)
+        tqf.ry(device, wires=2, params=params, comp_method=method)
+        tqf.hadamard(device, wires=0, comp_method=method)
+        tqf.hadamard(device, wires=[np.arange(3)[1]], comp_method=method)
+
+    check_all_close(qdev_compile.get_states_1d(), qdev.get_states_1d())
+
+
+def test_numba_kernels():
+    pytest.importorskip("numba")
+    from torchquantum.functional._numba_kernels import numba_matrix, use_numba
+    from torchquantum.functional.rz import rz_eigvals
+
+    for name, func, n_params in [
+        ("rx_matrix", tqf.rx_matrix, 1),
+        ("ry_matrix", tqf.ry_matrix, 1),
+        ("rz_matrix", tqf.rz_matrix, 1),
+        ("rz_eigvals", rz_eigvals, 1),
+        ("rot_matrix", tqf.rot_matrix, 3),
+        ("crx_matrix", tqf.crx_matrix, 1),
+    ]:
+        for bsz in [1, 3]:
+            params = torch.rand(bsz, n_params) * 2 * np.pi
+            check_all_close(numba_matrix(name, params), func(params))
+
+    # the complex64 kernels are not used for double precision states
+    assert not use_numba(tqf.rx_matrix, torch.rand(1, 1), torch.complex128)
+    qdev = tq.QuantumDevice(n_wires=1, dtype=torch.complex128)
+    tqf.rx(qdev, wires=0, params=0.3)
+    np.testing.assert_allclose(
+        qdev.get_states_1d().numpy(),
+        np.array([[np.cos(0.15), -1j * np.sin(0.15)]]),
+        atol=1e-12,
+    )
+
+
+def test_triton_kernels():
+    pytest.importorskip("triton")
+    if not torch.cuda.is_available():
+        pytest.skip("cuda is not available")
+    from torchquantum.functional._triton_kernels import apply_1q
+
+    for n_wires in range(1, 6):
+        for wire in range(n_wires):
+            for shape in [[2, 2], [3, 2, 2]]:
+                state = torch.randn([3] + [2] * n_wires, dtype=torch.complex64)
+                mat = torch.randn(shape, dtype=torch.complex64)
+                check_all_close(
+                    apply_1q(state.cuda(), mat.cuda(), wire),
+                    apply_unitary_bmm(state, mat, [wire]),
+                )
@@ -0,0 +1,102 @@
+"""
+MIT License
+
+Copyright (c) 2020-present TorchQuantum Authors
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import torch
+import torchquantum as tq
+import torchquantum.functional as tqf
+from torchquantum.measurement import (
+    expval_joint_analytical,
+    expval_joint_tensor_network,
+)
+
+import numpy as np
+import random
+
+
+def test_expval_joint_tensor_network():
+    n_wires = 4
+    random_layer = tq.RandomLayer(n_ops=100, wires=list(range(n_wires)))
+    qdev = tq.QuantumDevice(n_wires=n_wires, bsz=1, record_op=True)
+    random_layer(qdev)
+
+    for _ in range(20):
+        obs = "".join(random.choices(["X", "Y", "Z", "I"], k=n_wires))
+        assert np.allclose(
+            expval_joint_tensor_network(qdev.op_history, obs).numpy(),
+            expval_joint_analytical(qdev, observable=obs).detach().numpy(),
+            atol=1e-5,
+        )
+
+
+def test_expval_joint_tensor_network_batch():
+    n_wires = 3
+    qdev = tq.QuantumDevice(n_wires=n_wires, bsz=5, record_op=True)
+    params = torch.rand(5, 3)
+    tqf.hadamard(qdev, wires=0)
+    tqf.rx(qdev, wires=1, params=params[:, 0])
+    tqf.cnot(qdev, wires=[0, 2])
+    tqf.crx(qdev, wires=[2, 1], params=params[:, 1])
+    tqf.rot(qdev, wires=2, params=params, inverse=True)
+
+    for obs in ["ZZZ", "XIY", "IZI"]:
+        assert np.allclose(
+            expval_joint_tensor_network(qdev.op_history, obs).numpy(),
+            expval_joint_analytical(qdev, observable=obs).detach().numpy(),
+            atol=1e-5,
+        )
+
+
+def test_expval_joint_tensor_network_multi_params():
+    # op_history squeezes the params of a single gate with several params
+    qdev = tq.QuantumDevice(n_wires=2, bsz=1, record_op=True)
+    tqf.hadamard(qdev, wires=0)
+    tqf.rot(qdev, wires=0, params=torch.rand(1, 3))
+    tqf.u3(qdev, wires=1, params=torch.rand(1, 3))
+    tqf.cnot(qdev, wires=[0, 1])
+
+    for obs in ["XY", "ZX", "YI"]:
+        assert np.allclose(
+            expval_joint_tensor_network(qdev.op_history, obs).numpy(),
+            expval_joint_analytical(qdev, observable=obs).detach().numpy(),
+            atol=1e-5,
+        )
+
+    # the result has one value per batch, also when the gates acting on
+    # the observable are not batched
+    qdev = tq.QuantumDevice(n_wires=2, bsz=4, record_op=True)
+    tqf.rx(qdev, wires=0, params=torch.rand(4))
+    tqf.hadamard(qdev, wires=1)
+    for obs in ["II", "IX"]:
+        assert expval_joint_tensor_network(qdev.op_history, obs).shape == (4,)
+        assert np.allclose(
+            expval_joint_tensor_network(qdev.op_history, obs).numpy(),
+            expval_joint_analytical(qdev, observable=obs).detach().numpy(),
+            atol=1e-5,
+        )
+
+
+if __name__ == "__main__":
+    test_expval_joint_tensor_network()
+    test_expval_joint_tensor_network_batch()
+    test_expval_joint_tensor_network_multi_params()
@@ -28,6 +28,7 @@ import numpy as np
 
 from torchquantum.macro import C_DTYPE
 from torchquantum.functional import func_name_dict, func_name_dict_collect
+from torchquantum.functional.gate_wrapper import flush_gates
 
 from typing import Union
 
@@ -42,6 +43,8 @@ class QuantumDevice(nn.Module):
         bsz: int = 1,
         device: Union[torch.device, str] = "cpu",
         record_op: bool = False,
+        fuse_gates: bool = False,
+        dtype: torch.dtype = C_DTYPE,
     ):
         """A quantum device that contains the quantum state vector.
         Args:
@@ -51,8 +54,18 @@ class QuantumDevice(nn.Module):
             device: which classical computing device to use, 'cpu' or 'cuda'
             record_op: whether to record the operations on the quantum device and then
                 they can be used to construct a static computation graph
+            fuse_gates: whether to defer the gates and fuse consecutive gates
+                acting on the same wires before applying them. The deferred
+                gates are applied by flush(), which is called by
+                get_states_1d() and the measurements
+            dtype: complex dtype of the states, torch.complex64 (default) or
+                torch.complex128. The gate matrices are computed in the
+                precision of this dtype. Reduced precision (complex32, or
+                bfloat16 / float16 real and imaginary parts) is not supported
         """
         super().__init__()
+        if dtype not in [torch.complex64, torch.complex128]:
+            raise ValueError(f"States dtype {dtype} is not supported.")
         # number of qubits
         # the states are represented in a multi-dimension tensor
         # from left to right: qubit 0 to n
@@ -61,7 +74,7 @@ class QuantumDevice(nn.Module):
         self.bsz = bsz
         self.device = device
 
-        _state = torch.zeros(2**self.n_wires, dtype=C_DTYPE)
+        _state = torch.zeros(2**self.n_wires, dtype=dtype)
         _state[0] = 1 + 0j  # type: ignore
         _state = torch.reshape(_state, [2] * self.n_wires).to(self.device)
         self.register_buffer("state", _state)
@@ -73,30 +86,42 @@ class QuantumDevice(nn.Module):
         self.record_op = record_op
         self.op_history = []
 
+        self.fuse_gates = fuse_gates
+        self._pending = []
+
     def reset_op_history(self):
         """Resets the all Operation of the quantum device"""
         self.op_history = []
 
+    def flush(self):
+        """Apply the deferred gates to the states of the quantum device."""
+        if self._pending:
+            flush_gates(self)
+
     def clone_states(self, existing_states: torch.Tensor):
         """Clone the states of the quantum device."""
+        self._pending = []
         self.states = existing_states.clone()
 
     def set_states(self, states: torch.Tensor):
         """Set the states of the quantum device. The states are represented"""
         bsz = states.shape[0]
+        self._pending = []
         self.states = torch.reshape(states, [bsz] + [2] * self.n_wires)
 
     def reset_states(self, bsz: int):
         """Reset the States of the quantum device"""
         repeat_times = [bsz] + [1] * len(self.state.shape)
+        self._pending = []
         self.states = self.state.repeat(*repeat_times).to(self.state.device)
 
     def reset_identity_states(self):
         """Make the states as the identity matrix, one dim is the batch
         dim. Useful for verification.
         """
+        self._pending = []
         self.states = torch.eye(
-            2**self.n_wires, device=self.state.device, dtype=C_DTYPE
+            2**self.n_wires, device=self.state.device, dtype=self.state.dtype
         ).reshape([2**self.n_wires] + [2] * self.n_wires)
 
     def reset_all_eq_states(self, bsz: int):
@@ -104,15 +129,17 @@ class QuantumDevice(nn.Module):
         batch dim. Useful for verification.
         """
         energy = np.sqrt(1 / (2**self.n_wires) / 2)
-        all_eq_state = torch.ones(2**self.n_wires, dtype=C_DTYPE) * (
+        all_eq_state = torch.ones(2**self.n_wires, dtype=self.state.dtype) * (
             energy + energy * 1j
         )
         all_eq_state = all_eq_state.reshape([2] * self.n_wires)
         repeat_times = [bsz] + [1] * len(self.state.shape)
+        self._pending = []
         self.states = all_eq_state.repeat(*repeat_times).to(self.state.device)
 
     def get_states_1d(self):
         """Return the states in a 1d tensor."""
+        self.flush()
         bsz = self.states.shape[0]
         return torch.reshape(self.states, [bsz, 2**self.n_wires])
 
@@ -237,7 +237,8 @@ class StateEncoder(Encoder, metaclass=ABCMeta):
         )
         state = state.view([x.shape[0]] + [2] * qdev.n_wires)
 
-        qdev.states = state.type(C_DTYPE)
+        # set_states also drops the gates deferred on the device
+        qdev.set_states(state.type(qdev.states.dtype))
 
 
 class MagnitudeEncoder(Encoder, metaclass=ABCMeta):
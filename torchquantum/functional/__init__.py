@@ -22,7 +22,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+import torch
+
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ConstantGate,
+)
 from .hadamard import hadamard, shadamard, _hadamard_mat_dict, h, ch, sh, chadamard
 from .rx import rx, rxx, crx, xx, _rx_mat_dict, rx_matrix, rxx_matrix, crx_matrix
 from .ry import ry, ryy, cry, yy, _ry_mat_dict, ry_matrix, ryy_matrix, cry_matrix
@@ -122,6 +129,11 @@ mat_dict = {
     **_ecr_mat_dict,
 }
 
+# cache the device and dtype copies of the constant matrices
+for _mat in mat_dict.values():
+    if isinstance(_mat, torch.Tensor):
+        ConstantGate.from_tensor(_mat)
+
 func_name_dict = {
     "hadamard": hadamard,
     "h": h,
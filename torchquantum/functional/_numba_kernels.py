@@ -0,0 +1,164 @@
+import numpy as np
+import torch
+
+from ..macro import C_DTYPE
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def rx_mat_np(theta):
+    """Compute the rx unitaries of a batch of angles with shape (bsz, 1)."""
+    out = np.empty((theta.shape[0], 2, 2), dtype=np.complex64)
+    for i in range(theta.shape[0]):
+        co = np.cos(theta[i, 0] / 2)
+        si = np.sin(theta[i, 0] / 2)
+        out[i, 0, 0] = co
+        out[i, 0, 1] = complex(0, -si)
+        out[i, 1, 0] = complex(0, -si)
+        out[i, 1, 1] = co
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def ry_mat_np(theta):
+    """Compute the ry unitaries of a batch of angles with shape (bsz, 1)."""
+    out = np.empty((theta.shape[0], 2, 2), dtype=np.complex64)
+    for i in range(theta.shape[0]):
+        co = np.cos(theta[i, 0] / 2)
+        si = np.sin(theta[i, 0] / 2)
+        out[i, 0, 0] = co
+        out[i, 0, 1] = -si
+        out[i, 1, 0] = si
+        out[i, 1, 1] = co
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def rz_mat_np(theta):
+    """Compute the rz unitaries of a batch of angles with shape (bsz, 1)."""
+    out = np.zeros((theta.shape[0], 2, 2), dtype=np.complex64)
+    for i in range(theta.shape[0]):
+        co = np.cos(theta[i, 0] / 2)
+        si = np.sin(theta[i, 0] / 2)
+        out[i, 0, 0] = complex(co, -si)
+        out[i, 1, 1] = complex(co, si)
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def rz_eigvals_np(theta):
+    """Compute the rz eigenvalues of a batch of angles with shape (bsz, 1)."""
+    out = np.empty((theta.shape[0], 2), dtype=np.complex64)
+    for i in range(theta.shape[0]):
+        co = np.cos(theta[i, 0] / 2)
+        si = np.sin(theta[i, 0] / 2)
+        out[i, 0] = complex(co, -si)
+        out[i, 1] = complex(co, si)
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def rot_mat_np(params):
+    """Compute the rot unitaries of a batch of (phi, theta, omega) angles
+    with shape (bsz, 3)."""
+    out = np.empty((params.shape[0], 2, 2), dtype=np.complex64)
+    for i in range(params.shape[0]):
+        phi = params[i, 0] / 2
+        co = np.cos(params[i, 1] / 2)
+        si = np.sin(params[i, 1] / 2)
+        omega = params[i, 2] / 2
+        out[i, 0, 0] = co * np.exp(complex(0, -(phi + omega)))
+        out[i, 0, 1] = -si * np.exp(complex(0, phi - omega))
+        out[i, 1, 0] = si * np.exp(complex(0, -(phi - omega)))
+        out[i, 1, 1] = co * np.exp(complex(0, phi + omega))
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def crx_mat_np(theta):
+    """Compute the crx unitaries of a batch of angles with shape (bsz, 1)."""
+    out = np.zeros((theta.shape[0], 4, 4), dtype=np.complex64)
+    for i in range(theta.shape[0]):
+        co = np.cos(theta[i, 0] / 2)
+        si = np.sin(theta[i, 0] / 2)
+        out[i, 0, 0] = 1
+        out[i, 1, 1] = 1
+        out[i, 2, 2] = co
+        out[i, 2, 3] = complex(0, -si)
+        out[i, 3, 2] = complex(0, -si)
+        out[i, 3, 3] = co
+    return out
+
+
+# the numba kernels, keyed by the name of the torch function they replace
+NUMBA_KERNELS = (
+    {
+        "rx_matrix": (rx_mat_np, 1),
+        "ry_matrix": (ry_mat_np, 1),
+        "rz_matrix": (rz_mat_np, 1),
+        "rz_eigvals": (rz_eigvals_np, 1),
+        "rot_matrix": (rot_mat_np, 3),
+        "crx_matrix": (crx_mat_np, 1),
+    }
+    if HAS_NUMBA
+    else {}
+)
+
+
+def _is_compiling():
+    """Check whether the code is being traced by torch.compile."""
+    is_compiling = getattr(getattr(torch, "compiler", None), "is_compiling", None)
+    return is_compiling is not None and is_compiling()
+
+
+def use_numba(mat, params, dtype=C_DTYPE):
+    """Check whether the matrix of a gate can be computed by a numba kernel:
+    the kernel exists, the parameters are on cpu without autograd and the
+    matrix is applied in C_DTYPE, the precision of the kernels. The torch
+    function is kept under torch.compile, which can not trace numba.
+
+    Args:
+        mat (Callable): The torch function computing the matrix.
+        params (torch.Tensor): The parameters of the gate.
+        dtype (torch.dtype, optional): The dtype of the states the matrix
+            is applied to. Default to C_DTYPE.
+
+    Returns:
+        bool: Whether to call numba_matrix.
+
+    """
+    return (
+        getattr(mat, "__name__", None) in NUMBA_KERNELS
+        and dtype == C_DTYPE
+        and params is not None
+        and params.device.type == "cpu"
+        and not params.requires_grad
+        and not _is_compiling()
+    )
+
+
+def numba_matrix(name, params):
+    """Compute the unitary matrix (or eigenvalues) of a gate with its numba
+    kernel.
+
+    Args:
+        name (str): The name of the torch function computing the matrix.
+        params (torch.Tensor): The parameters of the gate.
+
+    Returns:
+        torch.Tensor: The computed unitary matrix, with the same shape as the
+            one returned by the torch function.
+
+    """
+    kernel, n_params = NUMBA_KERNELS[name]
+    params = np.asarray(params.detach().numpy(), dtype=np.float32)
+    return torch.from_numpy(kernel(params.reshape(-1, n_params))).squeeze(0)
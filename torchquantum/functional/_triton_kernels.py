@@ -0,0 +1,127 @@
+import torch
+
+from ._numba_kernels import _is_compiling
+
+try:
+    import triton
+    import triton.language as tl
+
+    HAS_TRITON = True
+except ImportError:
+    HAS_TRITON = False
+
+
+if HAS_TRITON:
+
+    @triton.jit
+    def _apply_1q_kernel(
+        state_ptr, out_ptr, mat_ptr, stride, half, mat_batch_stride, n_pairs,
+        BLOCK: tl.constexpr,
+    ):
+        # apply a 2x2 unitary to the pairs of amplitudes (s0, s1) that are
+        # stride apart, the complex tensors are read as interleaved
+        # (real, imag) floats
+        i = (tl.program_id(0) * BLOCK + tl.arange(0, BLOCK)).to(tl.int64)
+        mask = i < n_pairs
+
+        # batch, then the pair within the statevector of the batch
+        b = i // half
+        j = i % half
+        idx0 = 2 * (b * 2 * half + (j // stride) * 2 * stride + j % stride)
+        idx1 = idx0 + 2 * stride
+
+        s0r = tl.load(state_ptr + idx0, mask=mask)
+        s0i = tl.load(state_ptr + idx0 + 1, mask=mask)
+        s1r = tl.load(state_ptr + idx1, mask=mask)
+        s1i = tl.load(state_ptr + idx1 + 1, mask=mask)
+
+        m = mat_ptr + b * mat_batch_stride
+        m00r = tl.load(m, mask=mask)
+        m00i = tl.load(m + 1, mask=mask)
+        m01r = tl.load(m + 2, mask=mask)
+        m01i = tl.load(m + 3, mask=mask)
+        m10r = tl.load(m + 4, mask=mask)
+        m10i = tl.load(m + 5, mask=mask)
+        m11r = tl.load(m + 6, mask=mask)
+        m11i = tl.load(m + 7, mask=mask)
+
+        tl.store(
+            out_ptr + idx0,
+            m00r * s0r - m00i * s0i + m01r * s1r - m01i * s1i,
+            mask=mask,
+        )
+        tl.store(
+            out_ptr + idx0 + 1,
+            m00r * s0i + m00i * s0r + m01r * s1i + m01i * s1r,
+            mask=mask,
+        )
+        tl.store(
+            out_ptr + idx1,
+            m10r * s0r - m10i * s0i + m11r * s1r - m11i * s1i,
+            mask=mask,
+        )
+        tl.store(
+            out_ptr + idx1 + 1,
+            m10r * s0i + m10i * s0r + m11r * s1i + m11i * s1r,
+            mask=mask,
+        )
+
+
+def use_triton(state, mat):
+    """Check whether a single-qubit unitary can be applied by the triton
+    kernel: the state is on cuda, there is no autograd, and the unitary is
+    either shared by the batch or has one matrix per state. The torch path is
+    kept under torch.compile.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        mat (torch.Tensor): The 2x2 unitary matrix of the operation.
+
+    Returns:
+        bool: Whether to call apply_1q.
+
+    """
+    return (
+        HAS_TRITON
+        and state.is_cuda
+        and not (state.requires_grad or mat.requires_grad)
+        and (mat.dim() == 2 or mat.shape[0] in [1, state.shape[0]])
+        and not _is_compiling()
+    )
+
+
+def apply_1q(state, mat, wire):
+    """Apply a single-qubit unitary to the statevector with the triton
+    kernel, reading each pair of amplitudes once.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        mat (torch.Tensor): The unitary matrix, with shape (2, 2) or
+            (bsz, 2, 2), with the dtype and device of the state.
+        wire (int): Which qubit the operation is applied to.
+
+    Returns:
+        torch.Tensor: The new statevector.
+
+    """
+    state = state.contiguous()
+    mat = mat.reshape([-1, 2, 2]).contiguous()
+    out = torch.empty_like(state)
+
+    n_wires = state.dim() - 1
+    half = 2 ** (n_wires - 1)
+    n_pairs = state.shape[0] * half
+    block = 1024
+
+    _apply_1q_kernel[(triton.cdiv(n_pairs, block),)](
+        torch.view_as_real(state),
+        torch.view_as_real(out),
+        torch.view_as_real(mat),
+        2 ** (n_wires - 1 - wire),
+        half,
+        8 if mat.shape[0] > 1 else 0,
+        n_pairs,
+        BLOCK=block,
+    )
+
+    return out
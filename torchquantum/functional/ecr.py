@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    constant_matrix,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -16,9 +21,9 @@ else:
     QuantumDevice = None
 
 _ecr_mat_dict = {
-    "ecr": INV_SQRT2
-    * torch.tensor(
-        [[0, 0, 1, 1j], [0, 0, 1j, 1], [1, -1j, 0, 0], [-1j, 1, 0, 0]], dtype=C_DTYPE
+    "ecr": constant_matrix(
+        INV_SQRT2
+        * np.array([[0, 0, 1, 1j], [0, 0, 1j, 1], [1, -1j, 0, 0], [-1j, 1, 0, 0]])
     ),
 }
 
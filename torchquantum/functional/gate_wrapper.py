@@ -1,12 +1,16 @@
 import functools
+import types
 import torch
 import numpy as np
+import opt_einsum
 
 from typing import Callable, Union, Optional, List, Dict, TYPE_CHECKING
 from ..macro import C_DTYPE, F_DTYPE, ABC, ABC_ARRAY, INV_SQRT2
 from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
+from ._numba_kernels import use_numba, numba_matrix
+from ._triton_kernels import use_triton, apply_1q
 
 
 if TYPE_CHECKING:
@@ -15,8 +19,138 @@ else:
     QuantumDevice = None
 
 
+def cast_to_states(mat, state):
+    """Cast a gate matrix to the dtype and device of the statevector.
+
+    The matrix follows the complex dtype of the states (complex64 by default,
+    complex128 for double precision devices). It falls back to C_DTYPE if the
+    states are not complex.
+
+    Args:
+        mat (torch.Tensor): The unitary matrix (or eigenvalues) of the gate.
+        state (torch.Tensor): The statevector.
+
+    Returns:
+        torch.Tensor: The matrix with the dtype and device of the state.
+
+    """
+    if mat.dtype != state.dtype or mat.device != state.device:
+        dtype = state.dtype if state.is_complex() else C_DTYPE
+        mat = mat.to(device=state.device, dtype=dtype)
+    return mat
+
+
+def real_dtype(params):
+    """Get the real dtype the matrix of a gate is computed in: float64 for
+    double precision parameters, F_DTYPE otherwise.
+
+    Args:
+        params (torch.Tensor): The parameters of the gate.
+
+    Returns:
+        torch.dtype: The real dtype.
+
+    """
+    if params.dtype in [torch.float64, torch.complex128]:
+        return torch.float64
+    return F_DTYPE
+
+
+def complex_dtype(params):
+    """Get the complex dtype the matrix of a gate is computed in: complex128
+    for double precision parameters, C_DTYPE otherwise.
+
+    Args:
+        params (torch.Tensor): The parameters of the gate.
+
+    Returns:
+        torch.dtype: The complex dtype.
+
+    """
+    if params.dtype in [torch.float64, torch.complex128]:
+        return torch.complex128
+    return C_DTYPE
+
+
+def format_params(name, params, dtype=F_DTYPE):
+    """Bring the parameters of a gate to the shape the matrix functions take.
+
+    The matrix functions take params with shape (bsz, n_params), and the
+    unitary matrices of qubitunitary gates with shape (bsz, d, d). Numbers,
+    lists and arrays are converted to tensors, a 0-dim tensor is a single
+    parameter and a 1-dim tensor holds one parameter per batch.
+
+    Args:
+        name (str): The name of the operation.
+        params (torch.Tensor, number, list or np.ndarray): The parameters.
+        dtype (torch.dtype, optional): The real dtype the parameters are
+            cast to, which sets the precision of the matrix computed from
+            them. The unitary matrices of qubitunitary gates are cast to the
+            complex dtype of the same precision. Default to F_DTYPE.
+
+    Returns:
+        torch.Tensor: The parameters with the batch dimension first.
+
+    """
+    if name in ["qubitunitary", "qubitunitaryfast", "qubitunitarystrict"]:
+        # the complex dtype of the same precision
+        dtype = torch.complex128 if dtype == torch.float64 else C_DTYPE
+        if not isinstance(params, torch.Tensor):
+            # this is for qubitunitary gate
+            params = torch.tensor(params, dtype=dtype)
+        else:
+            params = params.type(dtype)
+        return params.unsqueeze(0) if params.dim() == 2 else params
+
+    if not isinstance(params, torch.Tensor):
+        # this is for directly inputting parameters as a number
+        params = torch.tensor(params, dtype=dtype)
+    else:
+        params = params.type(dtype)
+    return params.reshape(-1, 1) if params.dim() < 2 else params
+
+
+# above this number of target wires the einsum contraction is used instead
+# of the transpose + matmul kernel
+EINSUM_WIRES_THRESHOLD = 10
+
+# debug flag, apply all the unitaries with the einsum contraction
+USE_EINSUM_CONTRACTION = False
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_permutations(total_wires, wires):
+    """Compute the axis permutation bringing the target wires of a
+    statevector right after the batch axis, together with its inverse.
+
+    Args:
+        total_wires (int): Number of qubits of the statevector.
+        wires (Tuple[int]): Which qubit the operation is applied to.
+
+    Returns:
+        Tuple[Tuple[int], Tuple[int]]: The permutation and the inverse
+            permutation.
+
+    """
+    devices_dims = [w + 1 for w in wires]
+    rest_dims = [d for d in range(1, total_wires + 1) if d not in devices_dims]
+    permute_to = [0] + devices_dims + rest_dims
+    # pure python argsort, so that torch.compile does not trace it
+    permute_back = tuple(sorted(range(len(permute_to)), key=permute_to.__getitem__))
+
+    return tuple(permute_to), permute_back
+
+
 def apply_unitary_einsum(state, mat, wires):
-    """Apply the unitary to the statevector using torch.einsum method.
+    """Apply the unitary to the statevector using transpose and matmul.
+
+    A single unitary is contracted with the target axes of the statevector by
+    torch.tensordot. For a batch of unitaries, the target wires are permuted
+    to the front of the statevector so that the unitary can be applied with a
+    single batched matrix multiplication. The einsum contraction is only used
+    when the number of target wires exceeds EINSUM_WIRES_THRESHOLD, or when
+    USE_EINSUM_CONTRACTION is set. Single-qubit gates on cuda are applied by
+    a triton kernel when triton is installed.
 
     Args:
         state (torch.Tensor): The statevector.
@@ -28,67 +162,180 @@ def apply_unitary_einsum(state, mat, wires):
 
     """
     device_wires = wires
+    if USE_EINSUM_CONTRACTION or len(device_wires) > EINSUM_WIRES_THRESHOLD:
+        return _apply_unitary_einsum_contraction(state, mat, device_wires)
 
     # minus one because of batch
     total_wires = len(state.shape) - 1
+    # a batch of one unitary is applied to the whole batch of states at once
+    is_batch_unitary = len(mat.shape) > 2 and mat.shape[0] > 1
+    dim = 2 ** len(device_wires)
+
+    mat = cast_to_states(mat, state)
+
+    if len(device_wires) == 1 and use_triton(state, mat):
+        # single-qubit gate on cuda, one pass over the pairs of amplitudes
+        return apply_1q(state, mat, device_wires[0])
+
+    if not is_batch_unitary:
+        # matrix no batch, contract its input axes with the target axes and
+        # move the output axes back to the target positions
+        n_mat_wires = len(device_wires)
+        devices_dims = [w + 1 for w in device_wires]
+        new_state = torch.tensordot(
+            mat.reshape([2] * n_mat_wires * 2),
+            state,
+            dims=(list(range(n_mat_wires, n_mat_wires * 2)), devices_dims),
+        )
+        return new_state.movedim(list(range(n_mat_wires)), devices_dims)
+
+    permute_to, permute_back = _get_permutations(total_wires, tuple(device_wires))
+    permuted = state.permute(permute_to)
+    permuted_shape = permuted.shape
+
+    # both matrix and state are in batch mode, the state is flattened to
+    # (bsz, 2 ** k, 2 ** (n - k)) so that the gate is a single bmm
+    mat = mat.reshape([mat.shape[0], dim, dim])
+    permuted = permuted.reshape([state.shape[0], dim, -1])
+    if mat.shape[0] == state.shape[0]:
+        new_state = torch.bmm(mat, permuted)
+    else:
+        # batch of unitaries applied to a single state
+        new_state = torch.matmul(mat, permuted)
+        permuted_shape = [mat.shape[0]] + list(permuted_shape[1:])
 
-    if len(mat.shape) > 2:
-        is_batch_unitary = True
-        bsz = mat.shape[0]
-        shape_extension = [bsz]
-        # try:
-        #     assert state.shape[0] == bsz
-        # except AssertionError as err:
-        #     logger.exception(f"Batch size of Quantum Device must be the same"
-        #                      f" with that of gate unitary matrix")
-        #     raise err
+    new_state = new_state.reshape(permuted_shape).permute(permute_back)
 
-    else:
-        is_batch_unitary = False
-        shape_extension = []
+    return new_state
 
-    mat = mat.view(shape_extension + [2] * len(device_wires) * 2)
 
-    mat = mat.type(C_DTYPE).to(state.device)
+@functools.lru_cache(maxsize=4096)
+def _build_einsum_eq(total_wires, wires, is_batch_unitary):
+    """Build the einsum sublists applying a unitary to a statevector.
+
+    Indices are integers rather than letters, so the number of qubits is not
+    limited by the size of the alphabet.
 
+    Args:
+        total_wires (int): Number of qubits of the statevector.
+        wires (Tuple[int]): Which qubit the operation is applied to.
+        is_batch_unitary (bool): Whether the unitary has a batch dimension.
+
+    Returns:
+        Tuple[Tuple[Tuple[int], Tuple[int], Tuple[int]], List[int]]: The
+            sublists of the unitary, the statevector and the output, and the
+            shape of the unitary (without the batch dimension) expected by
+            them.
+
+    """
     # Tensor indices of the quantum state
-    state_indices = ABC[:total_wires]
+    state_indices = list(range(total_wires))
 
     # Indices of the quantum state affected by this operation
-    affected_indices = "".join(ABC_ARRAY[list(device_wires)].tolist())
+    affected_indices = list(wires)
 
     # All affected indices will be summed over, so we need the same number
     # of new indices
-    new_indices = ABC[total_wires: total_wires + len(device_wires)]
+    new_indices = list(range(total_wires, total_wires + len(wires)))
 
     # The new indices of the state are given by the old ones with the
     # affected indices replaced by the new_indices
-    new_state_indices = functools.reduce(
-        lambda old_string, idx_pair: old_string.replace(idx_pair[0], idx_pair[1]),
-        zip(affected_indices, new_indices),
-        state_indices,
+    new_state_indices = list(state_indices)
+    for affected, new in zip(affected_indices, new_indices):
+        new_state_indices[affected] = new
+
+    # Use the next free indice as the indice of batch
+    batch_index = total_wires + len(wires)
+    state_indices = [batch_index] + state_indices
+    new_state_indices = [batch_index] + new_state_indices
+    if is_batch_unitary:
+        new_indices = [batch_index] + new_indices
+
+    sublists = (
+        tuple(new_indices + affected_indices),
+        tuple(state_indices),
+        tuple(new_state_indices),
     )
 
-    # try:
-    #     cannot support too many qubits...
-    #     assert ABC[-1] not in state_indices + new_state_indices  \
-    #      + new_indices + affected_indices
-    # except AssertionError as err:
-    #     logger.exception(f"Cannot support too many qubit.")
-    #     raise err
+    return sublists, [2] * len(wires) * 2
 
-    state_indices = ABC[-1] + state_indices
-    new_state_indices = ABC[-1] + new_state_indices
-    if is_batch_unitary:
-        new_indices = ABC[-1] + new_indices
 
-    # We now put together the indices in the notation numpy einsum
-    # requires
-    einsum_indices = (
-        f"{new_indices}{affected_indices}," f"{state_indices}->{new_state_indices}"
+@functools.lru_cache(maxsize=4096)
+def _get_contract_expression(sublists, mat_shape, state_shape):
+    """Build the opt_einsum contraction applying a unitary to a statevector.
+
+    Args:
+        sublists (Tuple[Tuple[int]]): The sublists of the unitary, the
+            statevector and the output.
+        mat_shape (Tuple[int]): The shape of the unitary.
+        state_shape (Tuple[int]): The shape of the statevector.
+
+    Returns:
+        opt_einsum.contract.ContractExpression: The contraction, which
+            dispatches to torch.tensordot when possible.
+
+    """
+    mat_indices, state_indices, new_state_indices = (
+        "".join(opt_einsum.get_symbol(i) for i in sublist) for sublist in sublists
+    )
+    einsum_indices = f"{mat_indices},{state_indices}->{new_state_indices}"
+
+    return opt_einsum.contract_expression(
+        einsum_indices, mat_shape, state_shape, optimize="dp"
+    )
+
+
+def _apply_unitary_einsum_contraction(state, mat, wires):
+    """Apply the unitary to the statevector with an einsum contraction. The
+    contraction is done by opt_einsum, except for single-qubit gates.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        mat (torch.Tensor): The unitary matrix of the operation.
+        wires (int or List[int]): Which qubit the operation is applied to.
+
+    Returns:
+        torch.Tensor: The new statevector.
+
+    """
+    device_wires = wires
+
+    # minus one because of batch
+    total_wires = len(state.shape) - 1
+
+    if len(mat.shape) > 2:
+        is_batch_unitary = True
+        bsz = mat.shape[0]
+        shape_extension = [bsz]
+        # try:
+        #     assert state.shape[0] == bsz
+        # except AssertionError as err:
+        #     logger.exception(f"Batch size of Quantum Device must be the same"
+        #                      f" with that of gate unitary matrix")
+        #     raise err
+
+    else:
+        is_batch_unitary = False
+        shape_extension = []
+
+    sublists, mat_shape = _build_einsum_eq(
+        total_wires, tuple(device_wires), is_batch_unitary
     )
 
-    new_state = torch.einsum(einsum_indices, mat, state)
+    mat = mat.reshape(shape_extension + mat_shape)
+
+    mat = cast_to_states(mat, state)
+
+    if len(device_wires) == 1:
+        mat_indices, state_indices, new_state_indices = sublists
+        new_state = torch.einsum(
+            mat, mat_indices, state, state_indices, new_state_indices
+        )
+    else:
+        expr = _get_contract_expression(
+            sublists, tuple(mat.shape), tuple(state.shape)
+        )
+        new_state = expr(mat, state, backend="torch")
 
     return new_state
 
@@ -115,16 +362,15 @@ def apply_unitary_bmm(state, mat, wires):
     #         logger.exception(f"Batch size of Quantum Device must be the same"
     #                          f" with that of gate unitary matrix")
     #         raise err
-    mat = mat.type(C_DTYPE).to(state.device)
+    mat = cast_to_states(mat, state)
 
-    devices_dims = [w + 1 for w in device_wires]
-    permute_to = list(range(state.dim()))
-    for d in sorted(devices_dims, reverse=True):
-        del permute_to[d]
-    permute_to = permute_to[:1] + devices_dims + permute_to[1:]
-    permute_back = list(np.argsort(permute_to))
+    permute_to, permute_back = _get_permutations(state.dim() - 1, tuple(device_wires))
     original_shape = state.shape
-    permuted = state.permute(permute_to).reshape([original_shape[0], mat.shape[-1], -1])
+    permuted = state.permute(permute_to)
+    # the shape to restore before permuting back, it differs from the
+    # original shape when some axes are not of size 2 (slices of the state)
+    permuted_shape = permuted.shape
+    permuted = permuted.reshape([original_shape[0], mat.shape[-1], -1])
 
     if len(mat.shape) > 2:
         # both matrix and state are in batch mode
@@ -135,11 +381,83 @@ def apply_unitary_bmm(state, mat, wires):
         expand_shape = [bsz] + list(mat.shape)
         new_state = mat.expand(expand_shape).bmm(permuted)
 
-    new_state = new_state.view(original_shape).permute(permute_back)
+    new_state = new_state.view(permuted_shape).permute(permute_back)
 
     return new_state
 
 
+def _apply_unitary_einsum_spec(state, mat, wires):
+    # template of the specialized kernels, the wires are bound as default
+    return apply_unitary_einsum(state, mat, list(wires))
+
+
+@functools.lru_cache(maxsize=None)
+def apply_unitary_einsum_spec(n_wires, wires, is_batch_unitary, mode=None):
+    """Get apply_unitary_einsum compiled with torch.compile for a fixed
+    number of qubits, target wires and unitary batching.
+
+    Each (n_wires, wires, is_batch_unitary) gets a copy of a template
+    function with its own code object, with the wires bound as a default
+    argument, so that it gets its own torch.compile cache instead of
+    recompiling a shared one. The shapes are static, so a new batch size
+    triggers a recompilation.
+
+    Args:
+        n_wires (int): Number of qubits of the statevector.
+        wires (Tuple[int]): Which qubit the operation is applied to.
+        is_batch_unitary (bool): Whether the unitary has a batch dimension,
+            only used as part of the key.
+        mode (str, optional): The torch.compile mode. Default to None.
+            "reduce-overhead" reuses the output buffers of the CUDA graphs, so
+            the states have to be cloned between the gates.
+
+    Returns:
+        Callable: The compiled function of (state, mat), or
+            apply_unitary_einsum if torch.compile is not available.
+
+    """
+    if not hasattr(torch, "compile"):
+        return lambda state, mat: apply_unitary_einsum(state, mat, list(wires))
+
+    name = f"_apply_unitary_{n_wires}_{'_'.join(map(str, wires))}"
+    template = _apply_unitary_einsum_spec
+    code = template.__code__.replace(co_name=name)
+    if hasattr(code, "co_qualname"):
+        code = code.replace(co_qualname=name)
+    func = types.FunctionType(code, template.__globals__, name, (wires,))
+
+    return torch.compile(func, dynamic=False, mode=mode)
+
+
+def apply_unitary(state, mat, wires, method):
+    """Apply the unitary to the statevector with the given method.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        mat (torch.Tensor): The unitary matrix of the operation.
+        wires (int or List[int]): Which qubit the operation is applied to.
+        method (str): 'bmm', 'einsum' or 'compile', which uses the
+            apply_unitary_einsum kernel specialized by
+            apply_unitary_einsum_spec.
+
+    Returns:
+        torch.Tensor: The new statevector.
+
+    """
+    if method == "einsum":
+        return apply_unitary_einsum(state, mat, wires)
+    elif method == "bmm":
+        return apply_unitary_bmm(state, mat, wires)
+    elif method == "compile":
+        is_batch_unitary = mat.dim() > 2 and mat.shape[0] > 1
+        # plain ints, so that numpy integer wires share the same kernel
+        return apply_unitary_einsum_spec(
+            state.dim() - 1, tuple(int(w) for w in wires), is_batch_unitary
+        )(state, mat)
+    else:
+        raise NotImplementedError(f"Method {method} is not supported.")
+
+
 def apply_unitary_density_einsum(density, mat, wires):
     """Apply the unitary to the densitymatrix using torch.einsum method.
 
@@ -321,6 +639,348 @@ def apply_unitary_density_bmm(density, mat, wires):
     return new_density
 
 
+# maximum number of wires of a fused gate
+FUSION_MAX_WIRES = 2
+
+
+def _expand_matrix(mat, pos, n_wires):
+    """Embed a single-qubit matrix into a larger support with identities.
+
+    Args:
+        mat (torch.Tensor): The single-qubit matrix, optionally batched.
+        pos (int): Position of the qubit of mat in the larger support.
+        n_wires (int): Number of qubits of the larger support.
+
+    Returns:
+        torch.Tensor: The matrix I x ... x mat x ... x I.
+
+    """
+    left = 2**pos
+    right = 2 ** (n_wires - pos - 1)
+    eye_left = torch.eye(left, dtype=mat.dtype, device=mat.device)
+    eye_right = torch.eye(right, dtype=mat.dtype, device=mat.device)
+    batch_shape = list(mat.shape[:-2])
+    expanded = (
+        eye_left.reshape([left, 1, 1, left, 1, 1])
+        * mat.reshape(batch_shape + [1, 2, 1, 1, 2, 1])
+        * eye_right.reshape([1, 1, right, 1, 1, right])
+    )
+    return expanded.reshape(batch_shape + [2**n_wires, 2**n_wires])
+
+
+def enqueue_gate(q_device, matrix, wires, method):
+    """Defer a gate on the device, fusing it with the pending gate if both
+    act on a common support of at most FUSION_MAX_WIRES wires.
+
+    Gates acting on identical wires are multiplied together and single-qubit
+    gates are folded into the pending gate when their wire is contained in
+    its support (and vice versa). Otherwise the pending gate is applied
+    before the new gate is queued.
+
+    Args:
+        q_device (tq.QuantumDevice): The QuantumDevice.
+        matrix (torch.Tensor): The unitary matrix of the gate.
+        wires (List[int]): Which qubit(s) the gate is applied to.
+        method (str): 'bmm' or 'einsum' to compute matrix vector
+            multiplication.
+
+    Returns:
+        None.
+
+    """
+    matrix = cast_to_states(matrix, q_device.states)
+    wires = list(wires)
+
+    if q_device._pending:
+        last_matrix, last_wires, _ = q_device._pending[-1]
+        fused = None
+        if wires == last_wires:
+            fused = torch.matmul(matrix, last_matrix), wires
+        elif (
+            len(wires) == 1
+            and wires[0] in last_wires
+            and len(last_wires) <= FUSION_MAX_WIRES
+        ):
+            expanded = _expand_matrix(
+                matrix, last_wires.index(wires[0]), len(last_wires)
+            )
+            fused = torch.matmul(expanded, last_matrix), last_wires
+        elif (
+            len(last_wires) == 1
+            and last_wires[0] in wires
+            and len(wires) <= FUSION_MAX_WIRES
+        ):
+            expanded = _expand_matrix(
+                last_matrix, wires.index(last_wires[0]), len(wires)
+            )
+            fused = torch.matmul(matrix, expanded), wires
+
+        if fused is not None and len(fused[1]) <= FUSION_MAX_WIRES:
+            q_device._pending[-1] = (fused[0], fused[1], method)
+            return
+        flush_gates(q_device)
+
+    q_device._pending.append((matrix, wires, method))
+
+
+def flush_gates(q_device):
+    """Apply the gates deferred on the device to its statevector.
+
+    Args:
+        q_device (tq.QuantumDevice): The QuantumDevice.
+
+    Returns:
+        None.
+
+    """
+    pending = q_device._pending
+    q_device._pending = []
+    for matrix, wires, method in pending:
+        q_device.states = apply_unitary(q_device.states, matrix, wires, method)
+
+
+class DiagonalGate(object):
+    """The unitary matrix function of a diagonal gate (rz, multirz, ...),
+    tagged with the function computing its eigenvalues.
+
+    Calling a DiagonalGate computes the dense matrix, so it can be used in
+    place of the matrix function. gate_wrapper instead applies the
+    eigenvalues directly with apply_diagonal.
+
+    Args:
+        matrix (Callable): The function computing the unitary matrix.
+        eigvals (Callable): The function computing the eigenvalues, taking
+            the same arguments as matrix.
+
+    """
+
+    def __init__(self, matrix, eigvals):
+        self.matrix = matrix
+        self.eigvals = eigvals
+
+    def __call__(self, *args, **kwargs):
+        return self.matrix(*args, **kwargs)
+
+
+class ControlledGate(object):
+    """The unitary matrix (function) of a controlled gate (cnot, crx, ...),
+    tagged with the unitary applied to the target wires.
+
+    Calling a ControlledGate computes the dense matrix, so it can be used in
+    place of the matrix function. gate_wrapper instead applies the target
+    unitary to the control=1 subspace with apply_controlled. The gate
+    modules keep the dense matrices in their mat_dict and the
+    ControlledGate of the constant controlled gates in a separate
+    controlled dict (such as _x_controlled_dict), which their gate functions
+    pass to gate_wrapper.
+
+    Args:
+        matrix (Callable or torch.Tensor): The unitary matrix (function) of
+            the gate.
+        target (Callable or torch.Tensor): The unitary matrix (function) of
+            the target wires, taking the same arguments as matrix.
+        n_c_wires (int, optional): Number of control wires, which are the
+            first wires of the gate. Default to 1.
+
+    """
+
+    def __init__(self, matrix, target, n_c_wires=1):
+        self.matrix = matrix
+        self.target = target
+        self.n_c_wires = n_c_wires
+
+    def __call__(self, *args, **kwargs):
+        return self.matrix(*args, **kwargs)
+
+
+def apply_controlled(state, mat, c_wires, t_wires, method="einsum"):
+    """Apply a controlled unitary to the statevector. The unitary of the
+    target wires is only applied to the slice where all control wires are
+    |1>, and written into a copy of the state.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        mat (torch.Tensor): The unitary matrix of the target wires.
+        c_wires (List[int]): The control wires.
+        t_wires (List[int]): The target wires.
+        method (str, optional): The method applying the unitary to the
+            slice, see apply_unitary. Default to 'einsum'.
+
+    Returns:
+        torch.Tensor: The new statevector.
+
+    """
+    if mat.dim() == 3 and mat.shape[0] not in [1, state.shape[0]]:
+        # a batch of unitaries applied to a single state, the control=0
+        # slice is broadcast to the batch of the unitaries as well
+        state = state.expand([mat.shape[0]] + list(state.shape[1:]))
+
+    # the slices keep the control axes, so the wire indices stay valid
+    index = [slice(None)] * state.dim()
+    for wire in c_wires:
+        index[wire + 1] = slice(1, 2)
+    index = tuple(index)
+
+    # the state outside of the slice is copied over, with a single copy of
+    # the control=0 half when there is one control wire
+    dim = c_wires[0] + 1
+    new_state = torch.empty_like(state, memory_format=torch.contiguous_format)
+    new_state.narrow(dim, 0, 1).copy_(state.narrow(dim, 0, 1))
+    if len(c_wires) > 1:
+        new_state.narrow(dim, 1, 1).copy_(state.narrow(dim, 1, 1))
+    new_state[index] = apply_unitary(state[index], mat, t_wires, method)
+
+    return new_state
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_diagonal_layout(total_wires, wires):
+    """Compute how to broadcast the eigenvalues of a diagonal gate against
+    a statevector.
+
+    Args:
+        total_wires (int): Number of qubits of the statevector.
+        wires (Tuple[int]): Which qubit the operation is applied to.
+
+    Returns:
+        Tuple[Tuple[int], List[int]]: The permutation sorting the eigenvalue
+            axes by wire and the broadcast shape (without the batch dim).
+
+    """
+    permute_to = (0,) + tuple(
+        i + 1 for i in sorted(range(len(wires)), key=wires.__getitem__)
+    )
+    shape = [2 if w in wires else 1 for w in range(total_wires)]
+
+    return permute_to, shape
+
+
+def apply_diagonal(state, eigvals, wires):
+    """Apply a diagonal unitary to the statevector by elementwise
+    multiplication with its eigenvalues.
+
+    Args:
+        state (torch.Tensor): The statevector.
+        eigvals (torch.Tensor): The eigenvalues of the operation, with shape
+            (2 ** len(wires)) or (bsz, 2 ** len(wires)).
+        wires (int or List[int]): Which qubit the operation is applied to.
+
+    Returns:
+        torch.Tensor: The new statevector.
+
+    """
+    # minus one because of batch
+    total_wires = len(state.shape) - 1
+
+    eigvals = cast_to_states(eigvals, state)
+
+    permute_to, shape = _get_diagonal_layout(total_wires, tuple(wires))
+    eigvals = eigvals.reshape([-1] + [2] * len(wires)).permute(permute_to)
+    eigvals = eigvals.reshape([eigvals.shape[0]] + shape)
+
+    return state * eigvals
+
+
+class ConstantGate(object):
+    """The unitary matrix of a constant gate (hadamard, cnot, ...) with its
+    copies cast to the dtype and moved to the device of the states.
+
+    Args:
+        matrix (torch.Tensor): The constant unitary matrix of the gate.
+
+    """
+
+    # ConstantGate of each constant matrix, keyed by id(matrix). The
+    # ConstantGate holds a reference to the matrix so that the id stays valid.
+    # Only the matrices of mat_dict and constant_matrix are registered, the
+    # matrices built at runtime are not cached.
+    _registry = {}
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        # complex128 entries of the matrix, if they are not exact in C_DTYPE
+        self.exact = None
+        self._cache = {}
+
+    @classmethod
+    def from_tensor(cls, matrix):
+        """Get the ConstantGate of a constant matrix, creating it if needed.
+
+        Args:
+            matrix (torch.Tensor): The constant unitary matrix of the gate.
+
+        Returns:
+            ConstantGate: The ConstantGate of the matrix.
+
+        """
+        gate = cls.lookup(matrix)
+        if gate is None:
+            gate = cls(matrix)
+            cls._registry[id(matrix)] = gate
+        return gate
+
+    @classmethod
+    def lookup(cls, matrix):
+        """Get the ConstantGate of a matrix, if it is a registered constant.
+
+        Args:
+            matrix (torch.Tensor): The unitary matrix of the gate.
+
+        Returns:
+            ConstantGate or None: The ConstantGate of the matrix, or None if
+                the matrix is not registered.
+
+        """
+        gate = cls._registry.get(id(matrix))
+        if gate is None or gate.matrix is not matrix:
+            return None
+        return gate
+
+    def get(self, device, dtype, inverse=False):
+        """Get the matrix on a device with a dtype, populated lazily on first
+        use.
+
+        Args:
+            device (torch.device): The device of the states.
+            dtype (torch.dtype): The dtype of the states.
+            inverse (bool, optional): Whether to return the inverse of the
+                matrix. Default to False.
+
+        Returns:
+            torch.Tensor: The cached (inverse) matrix.
+
+        """
+        key = (device, dtype, inverse)
+        matrix = self._cache.get(key)
+        if matrix is None:
+            source = self.matrix if self.exact is None else self.exact
+            matrix = source.type(dtype).to(device)
+            if inverse:
+                matrix = torch.conj_physical(matrix).transpose(-1, -2).contiguous()
+            self._cache[key] = matrix
+        return matrix
+
+
+def constant_matrix(data):
+    """Create the C_DTYPE unitary matrix of a constant gate.
+
+    The complex128 entries are kept by the ConstantGate of the matrix, so
+    that the entries which are not exact in C_DTYPE (such as 1 / sqrt(2))
+    are not rounded on double precision devices.
+
+    Args:
+        data (list or np.ndarray): The entries of the matrix.
+
+    Returns:
+        torch.Tensor: The unitary matrix.
+
+    """
+    exact = torch.tensor(data, dtype=torch.complex128)
+    matrix = exact.type(C_DTYPE)
+    ConstantGate.from_tensor(matrix).exact = exact
+    return matrix
+
+
 def gate_wrapper(
         name,
         mat,
@@ -338,8 +998,9 @@ def gate_wrapper(
     Args:
         name (str): The name of the operation.
         mat (torch.Tensor): The unitary matrix of the gate.
-        method (str): 'bmm' or 'einsum' to compute matrix vector
-            multiplication.
+        method (str): 'bmm', 'einsum' or 'compile' to compute matrix vector
+            multiplication. 'compile' applies the gate with a kernel compiled
+            for its wires, see apply_unitary_einsum_spec.
         q_device (tq.QuantumDevice): The QuantumDevice.
         wires (Union[List[int], int]): Which qubit(s) to apply the gate.
         params (torch.Tensor, optional): Parameters (if any) of the gate.
@@ -358,23 +1019,18 @@ def gate_wrapper(
         None.
 
     """
-    if params is not None:
-        if not isinstance(params, torch.Tensor):
-            if name in ["qubitunitary", "qubitunitaryfast", "qubitunitarystrict"]:
-                # this is for qubitunitary gate
-                params = torch.tensor(params, dtype=C_DTYPE)
-            else:
-                # this is for directly inputting parameters as a number
-                params = torch.tensor(params, dtype=F_DTYPE)
+    if q_device.device_name == "noisedevice":
+        target = q_device.densities
+    else:
+        target = q_device.states
 
-        if name in ["qubitunitary", "qubitunitaryfast", "qubitunitarystrict"]:
-            params = params.unsqueeze(0) if params.dim() == 2 else params
-        else:
-            if params.dim() == 1:
-                params = params.unsqueeze(-1)
-            elif params.dim() == 0:
-                params = params.unsqueeze(-1).unsqueeze(-1)
-            # params = params.unsqueeze(-1) if params.dim() == 1 else params
+    if params is not None:
+        # the matrix is computed in the precision of the states
+        params = format_params(
+            name,
+            params,
+            torch.float64 if target.dtype == torch.complex128 else F_DTYPE,
+        )
     wires = [wires] if isinstance(wires, int) else wires
 
     if q_device.record_op:
@@ -403,17 +1059,43 @@ def gate_wrapper(
         )
     else:
         # in dynamic mode, the function is computed instantly
+        # diagonal gates are applied from their eigenvalues, unless they are
+        # fused or applied to a density matrix
+        is_diagonal = (
+            isinstance(mat, DiagonalGate)
+            and q_device.device_name != "noisedevice"
+            and not getattr(q_device, "fuse_gates", False)
+        )
+        is_controlled = (
+            isinstance(mat, ControlledGate)
+            and q_device.device_name != "noisedevice"
+            and not getattr(q_device, "fuse_gates", False)
+        )
+        if is_diagonal:
+            mat = mat.eigvals
+        elif is_controlled:
+            n_c_wires = mat.n_c_wires
+            mat = mat.target
+        elif isinstance(mat, (DiagonalGate, ControlledGate)):
+            mat = mat.matrix
+
         if isinstance(mat, Callable):
-            if n_wires is None or name in [
+            if use_numba(mat, params, target.dtype):
+                # numba kernel, cheaper than the torch ops when there is no
+                # autograd graph to record
+                matrix = numba_matrix(mat.__name__, params)
+            elif n_wires is None or name in [
                 "qubitunitary",
                 "qubitunitaryfast",
                 "qubitunitarystrict",
             ]:
                 matrix = mat(params)
-            elif name in ["multicnot", "multixcnot", "qft"]:
+            elif name in ["multicnot", "multixcnot"]:
                 # this is for gates that can be applied to arbitrary numbers of
                 # qubits but no params, such as multicnot
                 matrix = mat(n_wires)
+            elif name in ["qft"]:
+                matrix = mat(n_wires, dtype=target.dtype)
             elif name in ["multirz"]:
                 # this is for gates that can be applied to arbitrary numbers of
                 # qubits such as multirz
@@ -421,16 +1103,31 @@ def gate_wrapper(
             else:
                 matrix = mat(params)
 
+            if is_diagonal:
+                if inverse:
+                    matrix = matrix.conj()
+            elif inverse:
+                matrix = matrix.conj()
+                if matrix.dim() == 3:
+                    matrix = matrix.permute(0, 2, 1)
+                else:
+                    matrix = matrix.permute(1, 0)
+        elif ConstantGate.lookup(mat) is not None:
+            # constant gate, the cached copy is already on the right device
+            matrix = ConstantGate.lookup(mat).get(
+                target.device, target.dtype, inverse
+            )
         else:
-            matrix = mat
-
-        if inverse:
-            matrix = matrix.conj()
-            if matrix.dim() == 3:
-                matrix = matrix.permute(0, 2, 1)
-            else:
-                matrix = matrix.permute(1, 0)
-        assert np.log2(matrix.shape[-1]) == len(wires)
+            # matrix built by the caller, such as controlled_unitary, it is
+            # cast for this call only
+            matrix = cast_to_states(mat, target)
+            if inverse:
+                matrix = matrix.conj().transpose(-1, -2)
+
+        if is_controlled:
+            assert np.log2(matrix.shape[-1]) == len(wires) - n_c_wires
+        else:
+            assert np.log2(matrix.shape[-1]) == len(wires)
         if q_device.device_name=="noisedevice":
             density = q_device.densities
             print(density.shape)
@@ -438,10 +1135,23 @@ def gate_wrapper(
                 return
             elif method == "bmm":
                 q_device.densities = apply_unitary_density_bmm(density, matrix, wires)
+        elif is_diagonal:
+            # elementwise product with the eigenvalues, the same for all the
+            # methods
+            if method not in ["bmm", "einsum", "compile"]:
+                raise NotImplementedError(f"Method {method} is not supported.")
+            q_device.states = apply_diagonal(q_device.states, matrix, wires)
+        elif is_controlled:
+            q_device.states = apply_controlled(
+                q_device.states,
+                matrix,
+                wires[:n_c_wires],
+                wires[n_c_wires:],
+                method,
+            )
+        elif getattr(q_device, "fuse_gates", False):
+            # defer the gate so that it can be fused with the following ones
+            enqueue_gate(q_device, matrix, wires, method)
         else:
-            state = q_device.states
-            if method == "einsum":
-                q_device.states = apply_unitary_einsum(state, matrix, wires)
-            elif method == "bmm":
-                q_device.states = apply_unitary_bmm(state, matrix, wires)
+            q_device.states = apply_unitary(q_device.states, matrix, wires, method)
 
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -23,9 +28,9 @@ def globalphase_matrix(params):
     Returns:
         torch.Tensor: The computed unitary matrix.
     """
-    phase = params.type(C_DTYPE)
+    phase = params.type(complex_dtype(params))
     exp = torch.exp(1j * phase)
-    matrix = torch.tensor([[exp]], dtype=C_DTYPE, device=params.device)
+    matrix = torch.tensor([[exp]], dtype=phase.dtype, device=params.device)
 
     return matrix
 
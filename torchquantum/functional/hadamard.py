@@ -2,7 +2,7 @@ from typing import Callable, Union, Optional, List, Dict, TYPE_CHECKING
 from ..macro import C_DTYPE, F_DTYPE, ABC, ABC_ARRAY, INV_SQRT2
 import torch
 import numpy as np
-from .gate_wrapper import gate_wrapper
+from .gate_wrapper import gate_wrapper, ControlledGate, constant_matrix
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -10,24 +10,28 @@ else:
     QuantumDevice = None
 
 _hadamard_mat_dict = {
-    "hadamard": torch.tensor(
-        [[INV_SQRT2, INV_SQRT2], [INV_SQRT2, -INV_SQRT2]], dtype=C_DTYPE
+    "hadamard": constant_matrix(
+        [[INV_SQRT2, INV_SQRT2], [INV_SQRT2, -INV_SQRT2]]
     ),
-    "shadamard": torch.tensor(
+    "shadamard": constant_matrix(
         [
             [np.cos(np.pi / 8), -np.sin(np.pi / 8)],
             [np.sin(np.pi / 8), np.cos(np.pi / 8)],
-        ],
-        dtype=C_DTYPE,
+        ]
     ),
-    "chadamard": torch.tensor(
+    "chadamard": constant_matrix(
         [
             [1, 0, 0, 0],
             [0, 1, 0, 0],
             [0, 0, INV_SQRT2, INV_SQRT2],
             [0, 0, INV_SQRT2, -INV_SQRT2],
-        ],
-        dtype=C_DTYPE,
+        ]
+    ),
+}
+
+_hadamard_controlled_dict = {
+    "chadamard": ControlledGate(
+        _hadamard_mat_dict["chadamard"], _hadamard_mat_dict["hadamard"]
     ),
 }
 
@@ -160,7 +164,7 @@ def chadamard(
 
     name = "chadamard"
 
-    mat = mat_dict[name]
+    mat = _hadamard_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ControlledGate,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -149,6 +154,15 @@ _x_mat_dict = {
     ),
 }
 
+_x_controlled_dict = {
+    "cnot": ControlledGate(_x_mat_dict["cnot"], _x_mat_dict["paulix"]),
+    "c3x": ControlledGate(_x_mat_dict["c3x"], _x_mat_dict["paulix"], n_c_wires=3),
+    "c4x": ControlledGate(_x_mat_dict["c4x"], _x_mat_dict["paulix"], n_c_wires=4),
+    "toffoli": ControlledGate(
+        _x_mat_dict["toffoli"], _x_mat_dict["paulix"], n_c_wires=2
+    ),
+}
+
 
 def paulix(
     q_device,
@@ -229,7 +243,7 @@ def cnot(
 
     """
     name = "cnot"
-    mat = _x_mat_dict[name]
+    mat = _x_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -370,7 +384,7 @@ def c3x(
 
     """
     name = "c3x"
-    mat = _x_mat_dict[name]
+    mat = _x_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -414,7 +428,7 @@ def c4x(
         None.
     """
     name = "c4x"
-    mat = _x_mat_dict[name]
+    mat = _x_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -508,7 +522,7 @@ def toffoli(
 
     """
     name = "toffoli"
-    mat = mat_dict[name]
+    mat = _x_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
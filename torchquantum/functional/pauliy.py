@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ControlledGate,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -22,6 +27,10 @@ _y_mat_dict = {
     ),
 }
 
+_y_controlled_dict = {
+    "cy": ControlledGate(_y_mat_dict["cy"], _y_mat_dict["pauliy"]),
+}
+
 
 def pauliy(
     q_device,
@@ -102,7 +111,7 @@ def cy(
 
     """
     name = "cy"
-    mat = _y_mat_dict[name]
+    mat = _y_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ControlledGate,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -35,6 +40,11 @@ _z_mat_dict = {
     ),
 }
 
+_z_controlled_dict = {
+    "cz": ControlledGate(_z_mat_dict["cz"], _z_mat_dict["pauliz"]),
+    "ccz": ControlledGate(_z_mat_dict["ccz"], _z_mat_dict["pauliz"], n_c_wires=2),
+}
+
 
 def pauliz(
     q_device,
@@ -115,7 +125,7 @@ def cz(
 
     """
     name = "cz"
-    mat = _z_mat_dict[name]
+    mat = _z_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -162,7 +172,7 @@ def ccz(
 
     """
     name = "ccz"
-    mat = _z_mat_dict[name]
+    mat = _z_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
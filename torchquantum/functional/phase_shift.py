@@ -8,7 +8,13 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    DiagonalGate,
+    real_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -16,6 +22,22 @@ else:
     QuantumDevice = None
 
 
+def phaseshift_eigvals(params):
+    """Compute eigenvalue for phaseshift gate.
+
+    Args:
+        params (torch.Tensor): The rotation angle.
+
+    Returns:
+        torch.Tensor: The computed eigenvalues.
+
+    """
+    phi = params.type(real_dtype(params))
+    exp = torch.polar(torch.ones_like(phi), phi)
+
+    return torch.cat([torch.ones_like(exp), exp], dim=-1).squeeze(0)
+
+
 def phaseshift_matrix(params):
     """Compute unitary matrix for phaseshift gate.
 
@@ -26,26 +48,12 @@ def phaseshift_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params.type(C_DTYPE)
-    exp = torch.exp(1j * phi)
-
-    return torch.stack(
-        [
-            torch.cat(
-                [
-                    torch.ones(exp.shape, device=params.device),
-                    torch.zeros(exp.shape, device=params.device),
-                ],
-                dim=-1,
-            ),
-            torch.cat([torch.zeros(exp.shape, device=params.device), exp], dim=-1),
-        ],
-        dim=-2,
-    ).squeeze(0)
+    # diagonal, no need to build the off-diagonal zeros
+    return torch.diag_embed(phaseshift_eigvals(params))
 
 
 _phaseshift_mat_dict = {
-    "phaseshift": phaseshift_matrix,
+    "phaseshift": DiagonalGate(phaseshift_matrix, phaseshift_eigvals),
 }
 
 
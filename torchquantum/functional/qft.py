@@ -16,14 +16,15 @@ else:
     QuantumDevice = None
 
 
-def qft_matrix(n_wires):
+def qft_matrix(n_wires, dtype=torch.complex64):
     """Compute unitary matrix for QFT.
 
     Args:
         n_wires: the number of qubits
+        dtype: the complex dtype of the matrix
     """
     dimension = 2**n_wires
-    mat = torch.zeros((dimension, dimension), dtype=torch.complex64)
+    mat = torch.zeros((dimension, dimension), dtype=dtype)
     omega = np.exp(2 * np.pi * 1j / dimension)
 
     for m in range(dimension):
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -27,8 +32,8 @@ def r_matrix(params: torch.Tensor) -> torch.Tensor:
 
     """
 
-    theta = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    phi = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
+    theta = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    phi = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
     exp = torch.exp(-1j * phi)
     """
     Seems to be a pytorch bug. Have to explicitly cast the theta to a
@@ -18,6 +18,8 @@ else:
 
 def reset(q_device: QuantumDevice, wires, inverse=False):
     # reset the target qubits to 0, non-unitary operation
+    # the deferred gates have to be applied first
+    q_device.flush()
     state = q_device.states
 
     wires = [wires] if isinstance(wires, int) else wires
@@ -8,7 +8,13 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    real_dtype,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,32 +32,25 @@ def rot_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    theta = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
-    omega = params[:, 2].unsqueeze(dim=-1).type(C_DTYPE)
-
-    co = torch.cos(theta / 2)
-    si = torch.sin(theta / 2)
+    half = params.type(real_dtype(params)) / 2
+    phi = half[:, 0:1]
+    theta = half[:, 1:2]
+    omega = half[:, 2:3]
+
+    co = torch.cos(theta)
+    si = torch.sin(theta)
+
+    # entries are magnitude * exp(1j * angle)
+    mag = torch.cat([co, -si, si, co], dim=-1)
+    ang = torch.cat(
+        [-(phi + omega), phi - omega, -(phi - omega), phi + omega], dim=-1
+    )
 
-    return torch.stack(
-        [
-            torch.cat(
-                [
-                    torch.exp(-0.5j * (phi + omega)) * co,
-                    -torch.exp(0.5j * (phi - omega)) * si,
-                ],
-                dim=-1,
-            ),
-            torch.cat(
-                [
-                    torch.exp(-0.5j * (phi - omega)) * si,
-                    torch.exp(0.5j * (phi + omega)) * co,
-                ],
-                dim=-1,
-            ),
-        ],
-        dim=-2,
-    ).squeeze(0)
+    return (
+        torch.complex(mag * torch.cos(ang), mag * torch.sin(ang))
+        .view(co.shape[:-1] + (2, 2))
+        .squeeze(0)
+    )
 
 
 def crot_matrix(params):
@@ -64,9 +63,9 @@ def crot_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params[:, 0].type(C_DTYPE)
-    theta = params[:, 1].type(C_DTYPE)
-    omega = params[:, 2].type(C_DTYPE)
+    phi = params[:, 0].type(complex_dtype(params))
+    theta = params[:, 1].type(complex_dtype(params))
+    omega = params[:, 2].type(complex_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
@@ -74,7 +73,7 @@ def crot_matrix(params):
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
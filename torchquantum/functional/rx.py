@@ -8,7 +8,14 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ControlledGate,
+    real_dtype,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,24 +33,17 @@ def rx_matrix(params: torch.Tensor) -> torch.Tensor:
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
-    """
-    Seems to be a pytorch bug. Have to explicitly cast the theta to a
-    complex number. If directly theta = params, then get error:
-
-    allow_unreachable=True, accumulate_grad=True)  # allow_unreachable flag
-    RuntimeError: Expected isFloatingType(grad.scalar_type()) ||
-    (input_is_complex == grad_is_complex) to be true, but got false.
-    (Could this error message be improved?
-    If so, please report an enhancement request to PyTorch.)
-
-    """
+    # the entries are stacked into the matrix with a single allocation
+    theta = params.type(real_dtype(params))
     co = torch.cos(theta / 2)
-    jsi = 1j * torch.sin(-theta / 2)
+    jsi = torch.complex(torch.zeros_like(co), -torch.sin(theta / 2))
+    co = co.type(jsi.dtype)
 
-    return torch.stack(
-        [torch.cat([co, jsi], dim=-1), torch.cat([jsi, co], dim=-1)], dim=-2
-    ).squeeze(0)
+    return (
+        torch.stack([co, jsi, jsi, co], dim=-1)
+        .view(co.shape[:-1] + (2, 2))
+        .squeeze(0)
+    )
 
 
 def rxx_matrix(params):
@@ -57,14 +57,14 @@ def rxx_matrix(params):
 
     """
 
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     co = torch.cos(theta / 2)
     jsi = 1j * torch.sin(theta / 2)
 
     matrix = (
         torch.tensor(
             [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -94,31 +94,38 @@ def crx_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(real_dtype(params))
     co = torch.cos(theta / 2)
-    jsi = 1j * torch.sin(-theta / 2)
-
-    matrix = (
-        torch.tensor(
-            [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
-            device=params.device,
-        )
-        .unsqueeze(0)
-        .repeat(co.shape[0], 1, 1)
+    si = torch.sin(theta / 2)
+    zero = torch.zeros_like(co)
+    one = torch.ones_like(co)
+
+    real = torch.cat(
+        [
+            one, zero, zero, zero,
+            zero, one, zero, zero,
+            zero, zero, co, zero,
+            zero, zero, zero, co,
+        ],
+        dim=-1,
+    )
+    imag = torch.cat(
+        [
+            zero, zero, zero, zero,
+            zero, zero, zero, zero,
+            zero, zero, zero, -si,
+            zero, zero, -si, zero,
+        ],
+        dim=-1,
     )
-    matrix[:, 2, 2] = co[:, 0]
-    matrix[:, 2, 3] = jsi[:, 0]
-    matrix[:, 3, 2] = jsi[:, 0]
-    matrix[:, 3, 3] = co[:, 0]
 
-    return matrix.squeeze(0)
+    return torch.complex(real, imag).view(co.shape[:-1] + (4, 4)).squeeze(0)
 
 
 _rx_mat_dict = {
     "rx": rx_matrix,
     "rxx": rxx_matrix,
-    "crx": crx_matrix,
+    "crx": ControlledGate(crx_matrix, rx_matrix),
 }
 
 
@@ -8,7 +8,13 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    real_dtype,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,14 +32,14 @@ def cry_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
 
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -57,14 +63,17 @@ def ry_matrix(params: torch.Tensor) -> torch.Tensor:
         The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(real_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
 
-    return torch.stack(
-        [torch.cat([co, -si], dim=-1), torch.cat([si, co], dim=-1)], dim=-2
-    ).squeeze(0)
+    return (
+        torch.cat([co, -si, si, co], dim=-1)
+        .type(complex_dtype(params))
+        .view(co.shape[:-1] + (2, 2))
+        .squeeze(0)
+    )
 
 
 def ryy_matrix(params):
@@ -77,14 +86,14 @@ def ryy_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     co = torch.cos(theta / 2)
     jsi = 1j * torch.sin(theta / 2)
 
     matrix = (
         torch.tensor(
             [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -8,7 +8,14 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    DiagonalGate,
+    real_dtype,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -16,6 +23,12 @@ else:
     QuantumDevice = None
 
 
+@functools.lru_cache(maxsize=None)
+def _pauli_eigs_tensor(n_wires, device):
+    """Get pauli_eigs(n_wires) as a tensor on the device, computed once."""
+    return torch.tensor(pauli_eigs(n_wires), device=device)
+
+
 def multirz_eigvals(params, n_wires):
     """Compute eigenvalue for multiqubit RZ gate.
 
@@ -26,10 +39,8 @@ def multirz_eigvals(params, n_wires):
         torch.Tensor: The computed eigenvalues.
 
     """
-    theta = params.type(C_DTYPE)
-    return torch.exp(
-        -1j * theta / 2 * torch.tensor(pauli_eigs(n_wires)).to(params.device)
-    )
+    theta = params.type(complex_dtype(params))
+    return torch.exp(-1j * theta / 2 * _pauli_eigs_tensor(n_wires, params.device))
 
 
 def multirz_matrix(params, n_wires):
@@ -42,10 +53,27 @@ def multirz_matrix(params, n_wires):
         torch.Tensor: The computed unitary matrix.
 
     """
-    # torch diagonal not available for complex number
     eigvals = multirz_eigvals(params, n_wires)
-    dia = diag(eigvals)
-    return dia.squeeze(0)
+    return torch.diag_embed(eigvals).squeeze(0)
+
+
+def rzz_eigvals(params):
+    """Compute eigenvalue for RZZ gate.
+
+    Args:
+        params (torch.Tensor): The rotation angle.
+
+    Returns:
+        torch.Tensor: The computed eigenvalues.
+
+    """
+    theta = params.type(real_dtype(params))
+    co = torch.cos(theta / 2)
+    si = torch.sin(theta / 2)
+
+    return torch.complex(
+        torch.cat([co, co, co, co], dim=-1), torch.cat([-si, si, si, -si], dim=-1)
+    ).squeeze(0)
 
 
 def rzz_matrix(params):
@@ -58,14 +86,14 @@ def rzz_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     exp = torch.exp(-0.5j * theta)
     conj_exp = torch.conj(exp)
 
     matrix = (
         torch.tensor(
             [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -90,14 +118,14 @@ def rzx_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     co = torch.cos(theta / 2)
     jsi = 1j * torch.sin(theta / 2)
 
     matrix = (
         torch.tensor(
             [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -129,13 +157,13 @@ def crz_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     exp = torch.exp(-0.5j * theta)
 
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -147,6 +175,22 @@ def crz_matrix(params):
     return matrix.squeeze(0)
 
 
+def rz_eigvals(params: torch.Tensor) -> torch.Tensor:
+    """Compute eigenvalue for rz gate.
+
+    Args:
+        params: The rotation angle.
+
+    Returns:
+        The computed eigenvalues.
+
+    """
+    theta = params.type(real_dtype(params))
+    exp = torch.polar(torch.ones_like(theta), -theta / 2)
+
+    return torch.cat([exp, exp.conj()], dim=-1).squeeze(0)
+
+
 def rz_matrix(params: torch.Tensor) -> torch.Tensor:
     """Compute unitary matrix for rz gate.
 
@@ -157,24 +201,14 @@ def rz_matrix(params: torch.Tensor) -> torch.Tensor:
         The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
-    exp = torch.exp(-0.5j * theta)
-
-    return torch.stack(
-        [
-            torch.cat([exp, torch.zeros(exp.shape, device=params.device)], dim=-1),
-            torch.cat(
-                [torch.zeros(exp.shape, device=params.device), torch.conj(exp)], dim=-1
-            ),
-        ],
-        dim=-2,
-    ).squeeze(0)
+    # diagonal, no need to build the off-diagonal zeros
+    return torch.diag_embed(rz_eigvals(params))
 
 
 _rz_mat_dict = {
-    "multirz": multirz_matrix,
-    "rz": rz_matrix,
-    "rzz": rzz_matrix,
+    "multirz": DiagonalGate(multirz_matrix, multirz_eigvals),
+    "rz": DiagonalGate(rz_matrix, rz_eigvals),
+    "rzz": DiagonalGate(rzz_matrix, rzz_eigvals),
     "crz": crz_matrix,
     "rzx": rzx_matrix,
 }
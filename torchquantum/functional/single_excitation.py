@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,14 +31,14 @@ def singleexcitation_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params.type(C_DTYPE)
+    theta = params.type(complex_dtype(params))
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
 
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    ControlledGate,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -47,6 +52,10 @@ _swap_mat_dict = {
     ),
 }
 
+_swap_controlled_dict = {
+    "cswap": ControlledGate(_swap_mat_dict["cswap"], _swap_mat_dict["swap"]),
+}
+
 
 def swap(
     q_device,
@@ -174,7 +183,7 @@ def cswap(
 
     """
     name = "cswap"
-    mat = _swap_mat_dict[name]
+    mat = _swap_controlled_dict[name]
     gate_wrapper(
         name=name,
         mat=mat,
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    constant_matrix,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -17,8 +22,8 @@ else:
 
 
 _t_mat_dict = {
-    "t": torch.tensor([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=C_DTYPE),
-    "tdg": torch.tensor([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=C_DTYPE),
+    "t": constant_matrix([[1, 0], [0, np.exp(1j * np.pi / 4)]]),
+    "tdg": constant_matrix([[1, 0], [0, np.exp(-1j * np.pi / 4)]]),
 }
 
 
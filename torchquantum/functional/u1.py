@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,7 +31,7 @@ def u1_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params.type(C_DTYPE)
+    phi = params.type(complex_dtype(params))
     exp = torch.exp(1j * phi)
 
     return torch.stack(
@@ -54,13 +59,13 @@ def cu1_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params.type(C_DTYPE)
+    phi = params.type(complex_dtype(params))
     exp = torch.exp(1j * phi)
 
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
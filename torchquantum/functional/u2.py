@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,8 +31,8 @@ def u2_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    lam = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
+    phi = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    lam = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
 
     return INV_SQRT2 * torch.stack(
         [
@@ -51,13 +56,13 @@ def cu2_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    phi = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    lam = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
+    phi = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    lam = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
 
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -23,10 +28,10 @@ def cu_matrix(params):
     Returns:
         torch.Tensor: The computed unitary matrix.
     """
-    theta = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    phi = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
-    lam = params[:, 2].unsqueeze(dim=-1).type(C_DTYPE)
-    gamma = params[:, 3].unsqueeze(dim=-1).type(C_DTYPE)
+    theta = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    phi = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
+    lam = params[:, 2].unsqueeze(dim=-1).type(complex_dtype(params))
+    gamma = params[:, 3].unsqueeze(dim=-1).type(complex_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
@@ -34,7 +39,7 @@ def cu_matrix(params):
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -59,9 +64,9 @@ def u3_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    phi = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
-    lam = params[:, 2].unsqueeze(dim=-1).type(C_DTYPE)
+    theta = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    phi = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
+    lam = params[:, 2].unsqueeze(dim=-1).type(complex_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
@@ -87,9 +92,9 @@ def cu3_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    phi = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
-    lam = params[:, 2].unsqueeze(dim=-1).type(C_DTYPE)
+    theta = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    phi = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
+    lam = params[:, 2].unsqueeze(dim=-1).type(complex_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
@@ -97,7 +102,7 @@ def cu3_matrix(params):
     matrix = (
         torch.tensor(
             [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
-            dtype=C_DTYPE,
+            dtype=complex_dtype(params),
             device=params.device,
         )
         .unsqueeze(0)
@@ -8,7 +8,12 @@ from ..util.utils import pauli_eigs, diag
 from torchpack.utils.logging import logger
 from torchquantum.util import normalize_statevector
 
-from .gate_wrapper import gate_wrapper, apply_unitary_einsum, apply_unitary_bmm
+from .gate_wrapper import (
+    gate_wrapper,
+    apply_unitary_einsum,
+    apply_unitary_bmm,
+    complex_dtype,
+)
 
 if TYPE_CHECKING:
     from torchquantum.device import QuantumDevice
@@ -26,8 +31,8 @@ def xxminyy_matrix(params):
         torch.Tensor: The computed unitary matrix.
 
     """
-    theta = params[:, 0].unsqueeze(dim=-1).type(C_DTYPE)
-    beta = params[:, 1].unsqueeze(dim=-1).type(C_DTYPE)
+    theta = params[:, 0].unsqueeze(dim=-1).type(complex_dtype(params))
+    beta = params[:, 1].unsqueeze(dim=-1).type(complex_dtype(params))
 
     co = torch.cos(theta / 2)
     si = torch.sin(theta / 2)
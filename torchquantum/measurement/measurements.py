@@ -1,15 +1,17 @@
 import random
 
+import opt_einsum
 import torch
 import torchquantum as tq
 import torchquantum.functional as tqf
 import numpy as np
-from torchquantum.macro import F_DTYPE
+from torchquantum.macro import C_DTYPE, F_DTYPE
 
-from typing import Union, List
+from typing import Union, List, Dict
 from collections import Counter, OrderedDict
 
 from torchquantum.functional import mat_dict
+from torchquantum.functional.gate_wrapper import format_params
 # from ..operator import op_name_dict, Observable
 import torchquantum.operator as op
 from copy import deepcopy
@@ -19,6 +21,7 @@ __all__ = [
     "find_observable_groups",
     "expval_joint_sampling_grouping",
     "expval_joint_analytical",
+    "expval_joint_tensor_network",
     "expval_joint_sampling",
     "expval",
     "MeasureAll",
@@ -134,6 +137,7 @@ def expval_joint_sampling_grouping(
     expval_all_obs = {}
     for obs_group, obs_elements in groups.items():
         # for each group need to clone a new qdev and its states
+        qdev.flush()
         qdev_clone = tq.QuantumDevice(n_wires=qdev.n_wires, bsz=qdev.bsz, device=qdev.device)
         qdev_clone.clone_states(qdev.states)
 
@@ -200,6 +204,7 @@ def expval_joint_sampling(
     iden = op.op_name_dict["i"]
     pauli_dict = {"X": paulix, "Y": pauliy, "Z": pauliz, "I": iden}
 
+    qdev.flush()
     qdev_clone = tq.QuantumDevice(n_wires=qdev.n_wires, bsz=qdev.bsz, device=qdev.device)
     qdev_clone.clone_states(qdev.states)
 
@@ -279,6 +284,159 @@ def expval_joint_analytical(
     )
 
 
+def _op_params(op_dict: Dict) -> Union[torch.Tensor, None]:
+    """Get the params of an operation of an op list, such as
+    q_device.op_history, with the batch dimension first."""
+    name = op_dict["name"].lower()
+    params = op_dict.get("params")
+    if params is None:
+        return None
+
+    params = format_params(name, params)
+    # op_history squeezes the params, so the batch dimension of a single
+    # gate with several params has to be restored from its number of params
+    n_params = getattr(tq.op_name_dict.get(name), "num_params", -1)
+    if n_params > 1:
+        params = params.reshape(-1, n_params)
+
+    return params
+
+
+def _op_matrix(op_dict: Dict) -> torch.Tensor:
+    """Compute the unitary matrix of an operation of an op list, such as
+    q_device.op_history, with the same dispatch as gate_wrapper."""
+    name = op_dict["name"].lower()
+    wires = op_dict["wires"]
+    n_wires = op_dict.get("n_wires") or (1 if isinstance(wires, int) else len(wires))
+    params = _op_params(op_dict)
+    mat = mat_dict[name]
+
+    if not callable(mat):
+        matrix = mat
+    elif name in ["multicnot", "multixcnot", "qft"]:
+        matrix = mat(n_wires)
+    elif name in ["multirz"]:
+        matrix = mat(params, n_wires)
+    else:
+        matrix = mat(params)
+
+    if op_dict.get("inverse", False):
+        matrix = matrix.conj().transpose(-1, -2)
+
+    return matrix
+
+
+def expval_joint_tensor_network(
+        op_list: List[Dict],
+        observable: str,
+        optimize="auto",
+):
+    """
+    Compute the expectation value of a joint observable by contracting the
+    circuit as a tensor network, without evolving the statevector.
+    The network is <0|U^dagger O U|0>, with one tensor per gate, per |0> and
+    per single-qubit observable. Gates outside of the lightcone of the
+    observable cancel with their conjugate and are dropped, and the
+    contraction order is found by opt_einsum.
+    Args:
+        op_list: the operations of the circuit, in the format of
+            q_device.op_history or tq.build_module_op_list. The params can be
+            tensors, in which case the gradients are computed.
+        observable: the joint observable, on the qubit 0, 1, 2, 3, etc in this
+            order
+        optimize: the opt_einsum path optimizer, any of the strategies of
+            opt_einsum.contract or a PathOptimizer such as a
+            cotengra.HyperOptimizer
+    Returns:
+        the expectation value, with shape (bsz,)
+    Examples:
+    >>> import torchquantum as tq
+    >>> import torchquantum.functional as tqf
+    >>> x = tq.QuantumDevice(n_wires=2, record_op=True)
+    >>> tqf.hadamard(x, wires=0)
+    >>> tqf.x(x, wires=1)
+    >>> tqf.cnot(x, wires=[0, 1])
+    >>> print(expval_joint_tensor_network(x.op_history, 'ZZ'))
+    tensor([-1.0000])
+    """
+    observable = observable.upper()
+    pauli_dict = {
+        "X": mat_dict["paulix"],
+        "Y": mat_dict["pauliy"],
+        "Z": mat_dict["pauliz"],
+        "I": mat_dict["i"],
+    }
+
+    # the lightcone of the observable, from the last gate to the first one
+    active = {wire for wire, op in enumerate(observable) if op != "I"}
+    lightcone = []
+    for op_dict in reversed(op_list):
+        wires = op_dict["wires"]
+        wires = [wires] if isinstance(wires, int) else list(wires)
+        if active.intersection(wires):
+            lightcone.append((op_dict, wires))
+            active.update(wires)
+    lightcone.reverse()
+
+    # the batch size of the circuit, also set by the gates outside of the
+    # lightcone
+    all_params = [_op_params(op_dict) for op_dict in op_list]
+    bsz = max([p.shape[0] for p in all_params if p is not None] + [1])
+
+    if not active:
+        return torch.ones(bsz, dtype=F_DTYPE)
+
+    matrices = [_op_matrix(op_dict) for op_dict, _ in lightcone]
+    is_batch = any(m.dim() == 3 and m.shape[0] > 1 for m in matrices)
+    device = matrices[0].device if matrices else torch.device("cpu")
+
+    n_indices = [0]
+
+    def new_index():
+        n_indices[0] += 1
+        return opt_einsum.get_symbol(n_indices[0])
+
+    batch_index = opt_einsum.get_symbol(0)
+    operands, subscripts = [], []
+
+    # the ket U|0> and the bra <0|U^dagger, one index per wire and side
+    ket = {wire: new_index() for wire in active}
+    bra = {wire: new_index() for wire in active}
+    zero = torch.tensor([1, 0], dtype=C_DTYPE, device=device)
+    for wire in active:
+        operands += [zero, zero]
+        subscripts += [ket[wire], bra[wire]]
+
+    for matrix, (_, wires) in zip(matrices, lightcone):
+        matrix = matrix.to(device=device, dtype=C_DTYPE)
+        if matrix.dim() == 3 and matrix.shape[0] > 1:
+            shape, batch = [matrix.shape[0]], batch_index
+        else:
+            shape, batch = [], ""
+        matrix = matrix.reshape(shape + [2] * len(wires) * 2)
+        for side, tensor in [(ket, matrix), (bra, matrix.conj())]:
+            inputs = "".join(side[wire] for wire in wires)
+            for wire in wires:
+                side[wire] = new_index()
+            outputs = "".join(side[wire] for wire in wires)
+            operands.append(tensor)
+            subscripts.append(batch + outputs + inputs)
+
+    for wire in active:
+        operands.append(pauli_dict[observable[wire]].to(device))
+        subscripts.append(bra[wire] + ket[wire])
+
+    output = batch_index if is_batch else ""
+    expectation = opt_einsum.contract(
+        ",".join(subscripts) + "->" + output,
+        *operands,
+        optimize=optimize,
+        backend="torch",
+    )
+
+    return expectation.real.reshape(-1).expand(bsz)
+
+
 def expval(
         qdev: tq.QuantumDevice,
         wires: Union[int, List[int]],
@@ -294,6 +452,7 @@ def expval(
         for rotation in observable.diagonalizing_gates():
             rotation(qdev, wires=wire)
 
+    qdev.flush()
     states = qdev.states
     # compute magnitude
     state_mag = torch.abs(states) ** 2
@@ -364,6 +523,7 @@ class MeasureMultipleTimes(tq.QuantumModule):
 
         for layer in self.obs_list:
             # create a new q device for each time of measurement
+            qdev.flush()
             qdev_new = tq.QuantumDevice(n_wires=qdev.n_wires)
             qdev_new.clone_states(existing_states=qdev.states)
             qdev_new.state = qdev.state
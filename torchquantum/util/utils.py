@@ -76,6 +76,7 @@ __all__ = [
     "dm_to_mixture_of_state",
     "pauli_string_to_matrix",
     "parameter_shift_gradient",
+    "compile",
 ]
 
 
@@ -864,6 +865,7 @@ def partial_trace(
     Returns:
         A density matrix with only the qubits specified by keep_indices.
     """
+    q_device.flush()
     n_wires = q_device.n_wires
     keep_indices = np.array(keep_indices) + 1
     dm_left_index = np.arange(n_wires + 1)
@@ -1073,3 +1075,44 @@ def parameter_shift_gradient(model, input_data, expectation_operator, shift_rate
         
         gradient_of_par[idx-2] = (expectation_plus_shift - expectation_minus_shift) * 0.5
     return gradient_of_par
+
+
+def compile(model, backend="inductor", mode=None, fullgraph=False, dynamic=False, **kwargs):
+    """Compile a quantum circuit into a single graph with ``torch.compile``.
+
+    Eager execution dispatches every gate through ``gate_wrapper`` in Python.
+    Compiling traces the whole forward once, specialized on the wires and
+    the number of qubits of each gate, so the per-gate dispatch overhead is
+    paid at trace time only. Pass ``mode="reduce-overhead"`` to additionally
+    capture the circuit as a CUDA graph. The QuantumDevice should be created
+    outside of the compiled function and passed in as an argument.
+
+    Args:
+        model (tq.QuantumModule or callable): the circuit to compile.
+        backend (str, optional): the ``torch.compile`` backend.
+            Defaults to "inductor".
+        mode (str, optional): the ``torch.compile`` mode. Defaults to None.
+        fullgraph (bool, optional): raise on graph breaks instead of falling
+            back to eager for the offending region. Defaults to False.
+        dynamic (bool, optional): whether to trace with dynamic shapes.
+            Defaults to False, so the graph is specialized on the batch size.
+        **kwargs: forwarded to ``torch.compile``.
+
+    Returns:
+        The compiled model, or ``model`` itself if ``torch.compile`` is not
+        available in the installed torch version.
+    """
+    if not hasattr(torch, "compile"):
+        logger.warning(
+            f"torch.compile is not available in torch {torch.__version__}, "
+            f"running eagerly."
+        )
+        return model
+    return torch.compile(
+        model,
+        backend=backend,
+        mode=mode,
+        fullgraph=fullgraph,
+        dynamic=dynamic,
+        **kwargs,
+    )